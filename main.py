@@ -13,8 +13,9 @@ import sys
 from typing import Dict, List, Optional, Any
 
 # Import from our new modular structure
-from models import WidgetType, WidgetProperty, WidgetData, AppPreferences, PreferencesManager
+from models import WidgetType, WidgetData, AppPreferences, PreferencesManager
 from ui import WidgetToolbox, DesignCanvas, PropertiesEditor, CodeEditor, PopOutCodeEditor
+from ui._fonts import font
 from core import CodeParser, CodeGenerator
 from utils import APP_NAME, APP_VERSION
 
@@ -111,7 +112,7 @@ class GUIBuilderApp(ctk.CTk):
         self.status_bar = ctk.CTkLabel(
             self, 
             text="Ready", 
-            font=ctk.CTkFont(size=12),
+            font=font(12),
             anchor="w"
         )
         self.status_bar.grid(row=2, column=0, columnspan=3, sticky="ew", padx=5, pady=2)
@@ -306,10 +307,12 @@ class GUIBuilderApp(ctk.CTk):
         else:
             self.status_bar.configure(text="No widget selected")
     
-    def on_property_change(self, property_name: str, value: Any):
+    def on_property_change(self, property_name: str, value: Any, widget_id: Optional[str] = None):
         """Handle property changes"""
-        if hasattr(self.canvas, 'selected_widget_id') and self.canvas.selected_widget_id:
-            self.canvas.update_widget_property(self.canvas.selected_widget_id, property_name, value)
+        # Debounced entry edits name their widget, which may no longer be selected
+        widget_id = widget_id or getattr(self.canvas, 'selected_widget_id', None)
+        if widget_id:
+            self.canvas.update_widget_property(widget_id, property_name, value)
             self.status_bar.configure(text=f"Updated {property_name}")
     
     def on_code_change(self, code: str):
@@ -348,14 +351,14 @@ class GUIBuilderApp(ctk.CTk):
             widgets, window_props = CodeParser.parse_code_to_widgets(code)
             
             # Update canvas with parsed widgets
-            self.canvas.widgets = widgets
+            self.canvas.clear_widgets()
+            self.canvas.widgets.update(widgets)
             self.window_properties.update(window_props)
             
             # Re-render canvas
-            self.canvas.delete("all")
-            for widget in widgets.values():
-                self.canvas.render_widget(widget)
-            self.canvas.draw_grid()
+            with self.canvas.batch_updates():
+                for widget in widgets.values():
+                    self.canvas.render_widget(widget)
             
             self.status_bar.configure(text="Synced from code")
     
@@ -384,9 +387,7 @@ class GUIBuilderApp(ctk.CTk):
                 return
         
         # Clear canvas
-        self.canvas.widgets.clear()
-        self.canvas.delete("all")
-        self.canvas.draw_grid()
+        self.canvas.clear_widgets()
         self.canvas.deselect_all()
         
         # Reset state
@@ -407,34 +408,16 @@ class GUIBuilderApp(ctk.CTk):
                     data = json.load(f)
                 
                 # Load widgets
-                self.canvas.widgets.clear()
-                self.canvas.delete("all")
+                self.canvas.clear_widgets()
                 
                 for widget_data in data.get('widgets', []):
-                    widget = WidgetData(
-                        id=widget_data['id'],
-                        type=WidgetType(widget_data['type']),
-                        x=widget_data['x'],
-                        y=widget_data['y'],
-                        width=widget_data['width'],
-                        height=widget_data['height'],
-                        properties={
-                            k: WidgetProperty(
-                                name=v['name'],
-                                value=v['value'],
-                                type=v['type'],
-                                options=v.get('options')
-                            )
-                            for k, v in widget_data['properties'].items()
-                        }
-                    )
+                    widget = self.canvas.widget_from_record(widget_data)
                     self.canvas.widgets[widget.id] = widget
                     self.canvas.render_widget(widget)
                 
                 # Load window properties
                 self.window_properties.update(data.get('window_properties', {}))
                 
-                self.canvas.draw_grid()
                 self.current_file = file_path
                 self.project_modified = False
                 self.status_bar.configure(text=f"Opened: {os.path.basename(file_path)}")
@@ -521,9 +504,8 @@ class GUIBuilderApp(ctk.CTk):
     def clear_canvas(self):
         """Clear all widgets from canvas"""
         if self.canvas.widgets and messagebox.askyesno("Clear Canvas", "Are you sure you want to clear all widgets?"):
-            self.canvas.widgets.clear()
-            self.canvas.delete("all")
-            self.canvas.draw_grid()
+            self.canvas.save_state()  # Clearing is undoable as a whole
+            self.canvas.clear_widgets()
             self.canvas.deselect_all()
             self.project_modified = True
             self.status_bar.configure(text="Canvas cleared")
@@ -531,7 +513,7 @@ class GUIBuilderApp(ctk.CTk):
     def show_preferences(self):
         """Show preferences window"""
         from ui import PreferencesWindow
-        PreferencesWindow(self, self.prefs_manager)
+        PreferencesWindow.open(self, self.prefs_manager)
     
     def load_recent_files(self):
         """Load recent files list"""
@@ -611,22 +593,11 @@ class GUIBuilderApp(ctk.CTk):
                 data = json.load(f)
             
             # Clear current canvas
-            self.canvas.widgets.clear()
-            self.canvas.delete("all")
-            self.canvas.draw_grid()
+            self.canvas.clear_widgets()
             
             # Load widgets
             for widget_data in data.get('widgets', []):
-                widget_type = WidgetType(widget_data['type'])
-                widget = WidgetData(
-                    id=widget_data['id'],
-                    type=widget_type,
-                    x=widget_data['x'],
-                    y=widget_data['y'],
-                    width=widget_data['width'],
-                    height=widget_data['height'],
-                    properties={}
-                )
+                widget = self.canvas.widget_from_record(widget_data)
                 self.canvas.widgets[widget.id] = widget
             
             # Load window properties
@@ -5,11 +5,13 @@ Data models package for the GUI Builder application.
 
 from .widget_types import WidgetType, WidgetProperty, WidgetData
 from .preferences import AppPreferences, PreferencesManager
+from .history import HistoryEntry
 
 __all__ = [
     'WidgetType',
     'WidgetProperty', 
     'WidgetData',
     'AppPreferences',
-    'PreferencesManager'
+    'PreferencesManager',
+    'HistoryEntry'
 ]
@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+"""
+Undo/redo history records for the GUI Builder application.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Optional
+
+
+@dataclass
+class HistoryEntry:
+    """Represents one undoable change on the design canvas"""
+    op: str  # 'add', 'delete', 'move', 'resize', 'prop', 'snapshot'
+    widget_id: Optional[str]
+    before: Any  # Widget record before the change, None if the widget did not exist
+    after: Any  # Widget record after the change, None if the widget was removed
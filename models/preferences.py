@@ -128,6 +128,17 @@ class PreferencesManager:
             setattr(self.preferences, key, value)
             self.save_preferences()
     
+    def snapshot(self) -> dict:
+        """Get a copy of all preference values"""
+        return asdict(self.preferences)
+    
+    def update(self, values: dict):
+        """Set several preference values and save them once"""
+        for key, value in values.items():
+            if hasattr(self.preferences, key):
+                setattr(self.preferences, key, value)
+        self.save_preferences()
+    
     def reset_to_defaults(self):
         """Reset all preferences to default values"""
         self.preferences = AppPreferences()
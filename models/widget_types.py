@@ -3,6 +3,7 @@
 Widget type definitions and data models for the GUI Builder application.
 """
 
+import math
 from enum import Enum
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Any
@@ -19,18 +20,46 @@ class WidgetType(Enum):
     PROGRESSBAR = "Progressbar"
 
 
-@dataclass
-class WidgetProperty:
+class _OwnedProperty:
+    """Slot for the widget a property belongs to, kept out of the dataclass fields"""
+    __slots__ = ('_owner',)
+
+
+@dataclass(slots=True)
+class WidgetProperty(_OwnedProperty):
     """Represents a widget property"""
     name: str
     value: Any
     type: str  # 'str', 'int', 'bool', 'list', 'color'
     options: Optional[List[str]] = None
+    
+    def __setattr__(self, name, value):
+        """Set an attribute, dropping the owning widget's caches"""
+        object.__setattr__(self, name, value)
+        owner = getattr(self, '_owner', None)
+        if owner is not None:
+            owner.mark_dirty()
+
+
+_WIDGET_FIELDS = frozenset(('id', 'type', 'x', 'y', 'width', 'height', 'properties'))
+
+
+def _freeze(value):
+    """Return an immutable copy of a list value for the record cache"""
+    return tuple(value) if isinstance(value, list) else value
+
+
+def _thaw(value):
+    """Return a fresh list for a value frozen by _freeze"""
+    return list(value) if isinstance(value, tuple) else value
 
 
 @dataclass
 class WidgetData:
     """Represents a widget in the design canvas"""
+    # Cache slots are declared here rather than as fields so asdict() and fields() leave them out
+    __slots__ = ('id', 'type', 'x', 'y', 'width', 'height', 'properties', '_cached_record', '_value_fraction')
+    
     id: str
     type: WidgetType
     x: int
@@ -39,14 +68,54 @@ class WidgetData:
     height: int
     properties: Dict[str, WidgetProperty]
     
+    def __setattr__(self, name, value):
+        """Set an attribute, dropping the caches when a serialized field changes"""
+        object.__setattr__(self, name, value)
+        if name in _WIDGET_FIELDS:
+            self.mark_dirty()
+            if name == 'properties':
+                for prop in value.values():
+                    object.__setattr__(prop, '_owner', self)
+    
+    def mark_dirty(self):
+        """Invalidate the cached to_dict() output and derived values after a mutation"""
+        self._cached_record = None
+        self._value_fraction = None
+    
+    def value_fraction(self) -> float:
+        """Return how far along its range the slider or progress value is, from 0 to 1"""
+        if self._value_fraction is None:
+            props = self.properties
+            value = props["value"].value if "value" in props else 50
+            if self.type == WidgetType.SLIDER:
+                from_val = props["from_"].value if "from_" in props else 0
+                to_val = props["to"].value if "to" in props else 100
+                # An empty range has no meaningful position
+                self._value_fraction = (value - from_val) / (to_val - from_val) if to_val > from_val else math.nan
+            else:
+                self._value_fraction = value / 100
+        return self._value_fraction
+    
     def to_dict(self):
+        """Return a serializable record of the widget, built fresh from the cached snapshot"""
+        record = self._cached_record
+        if record is None:
+            # The snapshot is all tuples so it never aliases live lists or the dicts handed out
+            record = (self.id, self.type.value, self.x, self.y, self.width, self.height,
+                      tuple((k, v.name, _freeze(v.value), v.type,
+                             tuple(v.options) if v.options is not None else None)
+                            for k, v in self.properties.items()))
+            self._cached_record = record
+        
+        widget_id, type_value, x, y, width, height, properties = record
         return {
-            'id': self.id,
-            'type': self.type.value,
-            'x': self.x,
-            'y': self.y,
-            'width': self.width,
-            'height': self.height,
-            'properties': {k: {'name': v.name, 'value': v.value, 'type': v.type, 'options': v.options} 
-                          for k, v in self.properties.items()}
+            'id': widget_id,
+            'type': type_value,
+            'x': x,
+            'y': y,
+            'width': width,
+            'height': height,
+            'properties': {k: {'name': name, 'value': _thaw(value), 'type': prop_type,
+                               'options': list(options) if options is not None else None}
+                          for k, name, value, prop_type, options in properties}
         }
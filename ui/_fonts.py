@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+Shared fonts for the GUI Builder UI components.
+"""
+
+import customtkinter as ctk
+from typing import Dict, Optional, Tuple
+
+# Each CTkFont registers a named font with Tk, so equal fonts are created once
+_cache: Dict[Tuple[Optional[int], str, Optional[str]], ctk.CTkFont] = {}
+
+
+def font(size: Optional[int] = None, weight: str = "normal", family: Optional[str] = None) -> ctk.CTkFont:
+    """Get the shared font for a size, weight and family, creating it on first use"""
+    key = (size, weight, family)
+    cached = _cache.get(key)
+    if cached is None:
+        cached = _cache[key] = ctk.CTkFont(family=family, size=size, weight=weight)
+    return cached
@@ -5,6 +5,7 @@ Code editor components for the GUI Builder application.
 
 import customtkinter as ctk
 from typing import Optional, Callable
+from ._fonts import font
 
 
 class CodeEditor(ctk.CTkFrame):
@@ -21,7 +22,7 @@ class CodeEditor(ctk.CTkFrame):
         self.pack_propagate(False)
         
         # Title
-        title = ctk.CTkLabel(self, text="Code Editor", font=ctk.CTkFont(size=16, weight="bold"))
+        title = ctk.CTkLabel(self, text="Code Editor", font=font(16, "bold"))
         title.pack(pady=10)
         
         # Code text area with scrollbar
@@ -29,7 +30,7 @@ class CodeEditor(ctk.CTkFrame):
             self,
             width=380,
             height=500,
-            font=ctk.CTkFont(family="Consolas", size=11),
+            font=font(11, family="Consolas"),
             wrap="none"
         )
         self.code_text.pack(fill="both", expand=True, padx=10, pady=5)
@@ -88,13 +89,13 @@ class PopOutCodeEditor(ctk.CTkToplevel):
         main_frame.pack(fill="both", expand=True, padx=10, pady=10)
         
         # Title
-        title = ctk.CTkLabel(main_frame, text="Code Editor", font=ctk.CTkFont(size=16, weight="bold"))
+        title = ctk.CTkLabel(main_frame, text="Code Editor", font=font(16, "bold"))
         title.pack(pady=10)
         
         # Code text area with scrollbar
         self.code_text = ctk.CTkTextbox(
             main_frame,
-            font=ctk.CTkFont(family="Consolas", size=11),
+            font=font(11, family="Consolas"),
             wrap="none"
         )
         self.code_text.pack(fill="both", expand=True, padx=10, pady=5)
@@ -106,32 +107,32 @@ class PopOutCodeEditor(ctk.CTkToplevel):
         # Control buttons
         self.sync_button = ctk.CTkButton(
             controls_frame, text="🔄 Sync from Design", width=120, height=25,
-            command=self.sync_from_design, font=ctk.CTkFont(size=10)
+            command=self.sync_from_design, font=font(10)
         )
         self.sync_button.pack(side="left", padx=5, pady=5)
         
         self.validate_button = ctk.CTkButton(
             controls_frame, text="✅ Validate", width=80, height=25,
-            command=self.validate_code, font=ctk.CTkFont(size=10)
+            command=self.validate_code, font=font(10)
         )
         self.validate_button.pack(side="left", padx=5, pady=5)
         
         self.run_button = ctk.CTkButton(
             controls_frame, text="▶️ Run Code", width=80, height=25,
-            command=self.run_code, font=ctk.CTkFont(size=10)
+            command=self.run_code, font=font(10)
         )
         self.run_button.pack(side="left", padx=5, pady=5)
         
         self.export_button = ctk.CTkButton(
             controls_frame, text="💾 Export", width=80, height=25,
-            command=self.export_code, font=ctk.CTkFont(size=10)
+            command=self.export_code, font=font(10)
         )
         self.export_button.pack(side="right", padx=5, pady=5)
         
         # Pop-in button
         self.pop_in_button = ctk.CTkButton(
             controls_frame, text="📌 Pop Back In", width=100, height=25,
-            command=self.pop_back_in, font=ctk.CTkFont(size=10)
+            command=self.pop_back_in, font=font(10)
         )
         self.pop_in_button.pack(side="right", padx=5, pady=5)
         
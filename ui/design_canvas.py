@@ -4,10 +4,150 @@ Design canvas component for the GUI Builder application.
 """
 
 import customtkinter as ctk
+import math
 import tkinter as tk
 import uuid
-from typing import Dict, List, Optional, Any
+from collections import deque
+from contextlib import contextmanager
+from types import MappingProxyType
+from PIL import Image, ImageDraw, ImageTk
+from typing import Dict, List, Optional, Any, Set, Tuple
 from models.widget_types import WidgetType, WidgetProperty, WidgetData
+from models.history import HistoryEntry
+
+
+# Cell size in pixels of the spatial hash used for hit testing
+HIT_CELL_SIZE = 64
+
+# Side length in pixels of the square resize handles
+HANDLE_SIZE = 8
+
+# Per resize handle (move_x, move_y, width_sign, height_sign) applied to the pointer offset from the origin
+_HANDLE_DELTAS = (
+    (1, 1, -1, -1),  # Top-left
+    (0, 1, 1, -1),  # Top-right
+    (1, 0, -1, 1),  # Bottom-left
+    (0, 0, 1, 1),  # Bottom-right
+)
+
+# WidgetType members by value, avoiding the enum lookup machinery when rebuilding widgets
+_WT_CACHE: Dict[str, WidgetType] = {member.value: member for member in WidgetType}
+
+# Fill and outline colors per widget type
+_WIDGET_COLORS: Dict[WidgetType, Dict[str, str]] = {
+    WidgetType.BUTTON: {"fill": "#2d5a27", "outline": "#4a7c59"},  # Green tones
+    WidgetType.LABEL: {"fill": "#2b2b2b", "outline": "#666666"},  # Dark gray
+    WidgetType.ENTRY: {"fill": "#1a1a1a", "outline": "#555555"},  # Very dark
+    WidgetType.CHECKBOX: {"fill": "#3d2d5a", "outline": "#6a4c93"},  # Purple tones
+    WidgetType.COMBOBOX: {"fill": "#2d4a5a", "outline": "#4a7c8a"},  # Blue-gray
+    WidgetType.SLIDER: {"fill": "#5a2d2d", "outline": "#8a4a4a"},  # Red tones
+    WidgetType.PROGRESSBAR: {"fill": "#2d5a2d", "outline": "#4a7c4a"},  # Green tones
+}
+_DEFAULT_WIDGET_COLORS = {"fill": "#4a4a4a", "outline": "#666666"}  # Default gray
+
+# Label shown inside each widget type, built from its properties
+_WIDGET_DISPLAY_TEXT = {
+    WidgetType.BUTTON: lambda props: props["text"].value,
+    WidgetType.LABEL: lambda props: props["text"].value,
+    WidgetType.ENTRY: lambda props: props["placeholder"].value,
+    WidgetType.CHECKBOX: lambda props: props["text"].value,
+    WidgetType.COMBOBOX: lambda props: "Combobox",
+    WidgetType.SLIDER: lambda props: f"Slider ({props['value'].value})",
+    WidgetType.PROGRESSBAR: lambda props: f"Progress ({props['value'].value}%)",
+}
+# Read-only default property rows per widget type as (key, name, value, type, options)
+# Read-only default (key, name, value, type, options) rows per widget type, copied whenever a widget is created
+_DEFAULT_PROPERTY_ROWS = MappingProxyType({
+    WidgetType.BUTTON: (
+        ("text", "text", "Button", "str", None),
+        ("width", "width", 100, "int", None),
+        ("height", "height", 30, "int", None),
+        ("command", "command", "", "str", None),
+    ),
+    WidgetType.LABEL: (
+        ("text", "text", "Label", "str", None),
+        ("width", "width", 100, "int", None),
+        ("height", "height", 30, "int", None),
+        ("font_size", "font_size", 12, "int", None),
+    ),
+    WidgetType.ENTRY: (
+        ("placeholder", "placeholder", "Enter text...", "str", None),
+        ("width", "width", 100, "int", None),
+        ("height", "height", 30, "int", None),
+    ),
+    WidgetType.CHECKBOX: (
+        ("text", "text", "Checkbox", "str", None),
+        ("checked", "checked", False, "bool", None),
+        ("width", "width", 100, "int", None),
+        ("height", "height", 30, "int", None),
+    ),
+    WidgetType.COMBOBOX: (
+        ("values", "values", "Option 1,Option 2,Option 3", "str", None),
+        ("width", "width", 100, "int", None),
+        ("height", "height", 30, "int", None),
+    ),
+    WidgetType.SLIDER: (
+        ("from_", "from_", 0, "int", None),
+        ("to", "to", 100, "int", None),
+        ("value", "value", 50, "int", None),
+        ("width", "width", 200, "int", None),
+        ("height", "height", 20, "int", None),
+    ),
+    WidgetType.PROGRESSBAR: (
+        ("mode", "mode", "determinate", "list", ("determinate", "indeterminate")),
+        ("value", "value", 50, "int", None),
+        ("width", "width", 200, "int", None),
+        ("height", "height", 20, "int", None),
+    ),
+})
+
+
+def _properties_from_rows(rows) -> Dict[str, WidgetProperty]:
+    """Build fresh properties from (key, name, value, type, options) rows"""
+    # Options are stored as tuples so every widget gets its own list to edit
+    return {key: WidgetProperty(name, value, prop_type, list(options) if options is not None else None)
+            for key, name, value, prop_type, options in rows}
+
+
+class DragState:
+    """Mutable state of the current mouse drag on the design canvas"""
+    
+    __slots__ = ("x", "y", "widget", "mode", "handle",
+                 "original_x", "original_y", "original_width", "original_height",
+                 "click_offset_x", "click_offset_y", "before")
+    
+    def __init__(self):
+        self.reset()
+    
+    def reset(self):
+        """Clear the drag so motion events are ignored"""
+        self.x = 0  # Last pointer position seen during the drag
+        self.y = 0
+        self.widget: Optional[str] = None
+        self.mode: Optional[str] = None
+        self.handle = 0
+        self.original_x = 0
+        self.original_y = 0
+        self.original_width = 0
+        self.original_height = 0
+        self.click_offset_x = 0
+        self.click_offset_y = 0
+        self.before: Optional[dict] = None  # Widget record for the undo entry
+    
+    def start(self, event, widget_data: WidgetData, mode: str, handle: int = 0):
+        """Begin dragging a widget from the given mouse event"""
+        self.x = event.x
+        self.y = event.y
+        self.widget = widget_data.id
+        self.mode = mode
+        self.handle = handle
+        self.original_x = widget_data.x
+        self.original_y = widget_data.y
+        self.original_width = widget_data.width
+        self.original_height = widget_data.height
+        self.click_offset_x = event.x - widget_data.x
+        self.click_offset_y = event.y - widget_data.y
+        self.before = widget_data.to_dict()
 
 
 class DesignCanvas(ctk.CTkCanvas):
@@ -19,32 +159,136 @@ class DesignCanvas(ctk.CTkCanvas):
         self.status_bar = status_bar
         self.widgets: Dict[str, WidgetData] = {}
         self.selected_widget_id: Optional[str] = None
-        self.drag_data = {"x": 0, "y": 0, "widget": None}
+        self.drag_data = DragState()
         self.grid_size = 10  # Smaller grid for smoother movement
         self.show_grid = True
+        self._grid_photo = None  # Pre-rendered grid background
+        self._grid_key = None  # (width, height, grid_size) the grid image was drawn for
+        self._grid_drawn = None  # (show_grid, grid_size, width, height) currently on the canvas
+        self._cw, self._ch = 1, 1  # Canvas size, kept current by <Configure>
+        self._culled: Set[str] = set()  # Widgets left undrawn because they are outside the view
+        self._widget_items: Dict[str, List[tuple]] = {}  # (item type, item id) drawn for each widget
+        self._item_reuse: Optional[List[tuple]] = None  # Items left to patch in the current render
+        self._item_record: Optional[List[tuple]] = None  # Items drawn so far in the current render
         self.snap_to_grid = True  # Allow disabling grid snapping
         self.last_render_time = 0
         self.render_throttle = 16  # ~60 FPS
         self.canvas_interacting = False
-        self.render_queue = []  # Queue for batched rendering
+        self._pending_drag = None  # Latest (x, y) not yet applied to the dragged widget
+        self._drag_after_id = None
+        self._motion_bind_id = None  # <B1-Motion> binding, present only while a widget is grabbed
+        self._highlight_after = None  # Pending removal of the code update highlights
+        self._boundary_stale = False  # Boundary passes skipped during an interaction
+        self._interacting_after = None  # Pending timer that ends the interaction
+        
+        # Spatial hash for hit testing: cell -> ids of widgets overlapping it
+        self._cell_index: Dict[Tuple[int, int], Set[str]] = {}
+        self._widget_cells: Dict[str, tuple] = {}  # Cell span (x0, y0, x1, y1) per widget id
+        
+        # Edges (left, top, right, bottom) of every widget, kept up to date for the window boundary
+        self._widget_extents: Dict[str, tuple] = {}
+        self._min_left = 0
+        self._min_top = 0
+        self._max_right = 0
+        self._max_bottom = 0
+        self._extents_dirty = False
+        self.render_queue: Dict[str, None] = {}  # Ordered set of widget ids for batched rendering
         self.render_scheduled = False  # Prevent multiple render schedules
+        self._batch_depth = 0  # Nesting depth of batch_updates() blocks
+        self._render_after_id = None
         self.window_boundary_visible = True  # Show window boundary by default
+        self._boundary_state = None  # (width, height, outside widget geometry) last drawn
+        self._boundary_items: List[int] = []  # Outline, four corner markers and size label
+        self._boundary_covered = False  # Widget items were created above the boundary since it was raised
         
         # Clipboard and undo/redo functionality
         self.clipboard = None
-        self.undo_stack = []
-        self.redo_stack = []
         self.max_undo_steps = 50
+        self._pending_prop_edit = None  # (widget_id, property_name, before) of the current edit burst
+        self._prop_edit_after_id = None
+        self._status_after_id = None  # Pending status bar refresh
+        self.undo_stack = deque(maxlen=self.max_undo_steps)  # Oldest states drop off automatically
+        self.redo_stack = deque(maxlen=self.max_undo_steps)
+        self._prop_records: Dict[str, tuple] = {}  # Per-widget property tier for snapshots
+        self._item_tags: Dict[str, tuple] = {}  # Cached (widget tags, handle tags) per widget id
+        self._handle_items: List[int] = []  # Pooled resize handle items, reused for every selection
+        self._handles_owner: Optional[str] = None  # Widget the pooled handles are currently on
+        
+        # Main application window and its methods, resolved on first use
+        self._main_app = None
+        self._properties_editor = None
+        self._app_functions: Dict[str, Any] = {}
+        
+        # Per-type drawing of the extra details inside a widget
+        self._extra_drawers = {
+            WidgetType.BUTTON: self._draw_button_extras,
+            WidgetType.ENTRY: self._draw_entry_extras,
+            WidgetType.CHECKBOX: self._draw_checkbox_extras,
+            WidgetType.COMBOBOX: self._draw_combobox_extras,
+            WidgetType.SLIDER: self._draw_slider_extras,
+            WidgetType.PROGRESSBAR: self._draw_progressbar_extras,
+        }
+        
+        # Context menu is built once and retargeted on each right-click
+        self._ctx_target: Optional[str] = None
+        self._ctx_menu = tk.Menu(self, tearoff=0)
+        self._ctx_menu.add_command(label="Delete", command=self._ctx_delete)
+        self._ctx_menu.add_command(label="Duplicate", command=self._ctx_duplicate)
+        self._ctx_menu.add_command(label="Bring to Front", command=self._ctx_bring_to_front)
+        self._ctx_menu.add_command(label="Send to Back", command=self._ctx_send_to_back)
         
         self.setup_bindings()
         self.draw_grid()
     
+    @property
+    def main_app(self):
+        """Top-level application window, cached after the first lookup"""
+        if self._main_app is None:
+            self._main_app = self.winfo_toplevel()
+        return self._main_app
+    
+    @property
+    def properties_editor(self):
+        """Properties editor of the main application, or None until it has one"""
+        if self._properties_editor is None:
+            self._properties_editor = getattr(self.main_app, 'properties_editor', None)
+        return self._properties_editor
+    
+    def app_function(self, name: str):
+        """Return a method of the main application by name, or None if it has none"""
+        function = self._app_functions.get(name)
+        if function is None and name not in self._app_functions:
+            function = self._app_functions[name] = getattr(self.main_app, name, None)
+        return function
+    
+    @property
+    def grid_size(self) -> int:
+        """Grid spacing in pixels"""
+        return self._grid_size
+    
+    @grid_size.setter
+    def grid_size(self, value: int):
+        """Set grid spacing and precompute the integer snapping constants"""
+        self._grid_size = max(1, int(value))
+        self._grid_half = self._grid_size >> 1
+        # Power-of-two grids can snap with a bit mask instead of a division
+        if self._grid_size & (self._grid_size - 1) == 0:
+            self._grid_mask = ~(self._grid_size - 1)
+        else:
+            self._grid_mask = None
+    
+    def snap(self, value: int) -> int:
+        """Snap a coordinate to the nearest grid line"""
+        if self._grid_mask is not None:
+            return (value + self._grid_half) & self._grid_mask
+        return (value + self._grid_half) // self._grid_size * self._grid_size
+    
     def setup_bindings(self):
         """Setup mouse event bindings"""
         self.bind("<Button-1>", self.on_canvas_click)
-        self.bind("<B1-Motion>", self.on_canvas_drag)
         self.bind("<ButtonRelease-1>", self.on_canvas_release)
         self.bind("<Button-3>", self.on_right_click)
+        self.bind("<Configure>", self._on_configure, add="+")
         
         # Keyboard shortcuts
         self.bind("<KeyPress-Delete>", self.on_delete_key)
@@ -67,33 +311,63 @@ class DesignCanvas(ctk.CTkCanvas):
         self.bind("<FocusOut>", lambda e: None)
         self.focus_set()
     
+    def _on_configure(self, event):
+        """Track the canvas size and redraw the grid when it changes"""
+        if (event.width, event.height) != (self._cw, self._ch):
+            self._cw, self._ch = event.width, event.height
+            self.draw_grid()
+            # Widgets culled at the old size may be visible now
+            for widget_id in self._culled:
+                self.render_widget(self.widgets[widget_id])
+    
     def draw_grid(self):
         """Draw grid lines on canvas"""
-        if not self.show_grid:
+        width, height = self._cw, self._ch
+        
+        # Nothing to do if the grid on screen already matches
+        drawn = (self.show_grid, self.grid_size, width, height)
+        if drawn == self._grid_drawn:
             return
-            
+        self._grid_drawn = drawn
+        
         self.delete("grid")
-        width = self.winfo_width()
-        height = self.winfo_height()
+        if not self.show_grid:
+            return
         
         if width <= 1 or height <= 1:  # Canvas not ready
             return
         
-        # Draw vertical lines
-        for x in range(0, width, self.grid_size):
-            self.create_line(x, 0, x, height, fill="#404040", width=1, tags="grid")
+        # Render the grid into a single image, only when the size or spacing changes
+        key = (width, height, self.grid_size)
+        if self._grid_key != key:
+            image = Image.new("RGB", (width, height), "#2b2b2b")
+            draw = ImageDraw.Draw(image)
+            
+            # Draw vertical lines
+            for x in range(0, width, self.grid_size):
+                draw.line((x, 0, x, height), fill="#404040", width=1)
+            
+            # Draw horizontal lines
+            for y in range(0, height, self.grid_size):
+                draw.line((0, y, width, y), fill="#404040", width=1)
+            
+            self._grid_photo = ImageTk.PhotoImage(image, master=self)
+            self._grid_key = key
         
-        # Draw horizontal lines
-        for y in range(0, height, self.grid_size):
-            self.create_line(0, y, width, y, fill="#404040", width=1, tags="grid")
+        self.create_image(0, 0, anchor="nw", image=self._grid_photo, tags="grid")
+        self.tag_lower("grid")
     
     def draw_window_boundary(self):
         """Draw the window boundary to show actual window size"""
         if not self.window_boundary_visible:
+            self.delete("window_boundary")
+            self.delete("boundary_warning")
+            self._boundary_state = None
+            self._boundary_items = []
             return
         
         # Get window properties from main app
-        main_app = self.winfo_toplevel()
+        main_app = self.main_app
         if not hasattr(main_app, 'window_properties'):
             return
         
@@ -101,27 +375,28 @@ class DesignCanvas(ctk.CTkCanvas):
         
         # Calculate actual window size (considering auto-fit)
         if window_props.get('auto_fit', True) and self.widgets:
-            max_x = max(widget.x + widget.width for widget in self.widgets.values()) + 50
-            max_y = max(widget.y + widget.height for widget in self.widgets.values()) + 50
+            max_right, max_bottom = self.get_widget_extents()
+            max_x = max_right + 50
+            max_y = max_bottom + 50
             window_width = max(window_props['width'], max_x)
             window_height = max(window_props['height'], max_y)
         else:
             window_width = window_props['width']
             window_height = window_props['height']
         
-        # Remove existing boundary
-        self.delete("window_boundary")
-        
-        # Draw window boundary rectangle
-        self.create_rectangle(
-            0, 0, window_width, window_height,
-            outline="#ff6b6b",  # Red outline
-            width=3,
-            dash=(5, 5),  # Dashed line
-            tags="window_boundary"
-        )
+        # Nothing to redraw if the size and the widgets outside it are unchanged
+        self._boundary_stale = False
+        outside_widgets = self.find_widgets_outside_boundary(window_width, window_height)
+        state = (window_width, window_height,
+                 tuple((w.id, w.x, w.y, w.width, w.height) for w in outside_widgets))
+        if state == self._boundary_state:
+            # The boundary is unchanged, but newer widget items may sit on top of it
+            if self._boundary_covered:
+                self._raise_boundary()
+            return
+        self._boundary_state = state
         
-        # Add corner markers
+        # The boundary items are created once and moved when the window size changes
         corner_size = 10
         corners = [
             (0, 0),  # Top-left
@@ -129,34 +404,110 @@ class DesignCanvas(ctk.CTkCanvas):
             (0, window_height),  # Bottom-left
             (window_width, window_height)  # Bottom-right
         ]
+        label_text = f"Window: {window_width}×{window_height}"
         
-        for x, y in corners:
-            self.create_rectangle(
-                x - corner_size//2, y - corner_size//2,
-                x + corner_size//2, y + corner_size//2,
+        if not self._boundary_items:
+            # Draw window boundary rectangle
+            self._boundary_items.append(self.create_rectangle(
+                0, 0, window_width, window_height,
+                outline="#ff6b6b",  # Red outline
+                width=3,
+                dash=(5, 5),  # Dashed line
+                tags="window_boundary"
+            ))
+            
+            # Add corner markers
+            for x, y in corners:
+                self._boundary_items.append(self.create_rectangle(
+                    x - corner_size//2, y - corner_size//2,
+                    x + corner_size//2, y + corner_size//2,
+                    fill="#ff6b6b",
+                    outline="#ffffff",
+                    width=2,
+                    tags="window_boundary"
+                ))
+            
+            # Add size label
+            self._boundary_items.append(self.create_text(
+                window_width//2, 20,
+                text=label_text,
                 fill="#ff6b6b",
-                outline="#ffffff",
-                width=2,
+                font=("Arial", 12, "bold"),
                 tags="window_boundary"
-            )
-        
-        # Add size label
-        label_text = f"Window: {window_width}×{window_height}"
-        self.create_text(
-            window_width//2, 20,
-            text=label_text,
-            fill="#ff6b6b",
-            font=("Arial", 12, "bold"),
-            tags="window_boundary"
-        )
+            ))
+        else:
+            outline, *corner_items, label = self._boundary_items
+            self.coords(outline, 0, 0, window_width, window_height)
+            for item, (x, y) in zip(corner_items, corners):
+                self.coords(item, x - corner_size//2, y - corner_size//2,
+                            x + corner_size//2, y + corner_size//2)
+            self.coords(label, window_width//2, 20)
+            self.itemconfigure(label, text=label_text)
+            self.tag_raise("window_boundary")
         
         # Add warning for widgets outside boundary
-        self.check_widgets_outside_boundary(window_width, window_height)
+        self.check_widgets_outside_boundary(window_width, window_height, outside_widgets)
+        self._boundary_covered = False
     
-    def check_widgets_outside_boundary(self, window_width: int, window_height: int):
-        """Check for widgets outside the window boundary and show warnings"""
-        # Remove existing warnings
-        self.delete("boundary_warning")
+    def _raise_boundary(self):
+        """Lift the window boundary and its warnings back above the widget items"""
+        self.tag_raise("window_boundary")
+        self.tag_raise("boundary_warning")
+        self._boundary_covered = False
+    
+    def _track_extents(self, widget_id: str, x: int, y: int, right: int, bottom: int):
+        """Record a widget's edges and extend the cached bounds"""
+        old = self._widget_extents.get(widget_id)
+        self._widget_extents[widget_id] = (x, y, right, bottom)
+        
+        # Pulling in an edge that defines the bounds needs a rescan
+        if old and ((old[0] == self._min_left and x > old[0]) or
+                    (old[1] == self._min_top and y > old[1]) or
+                    (old[2] == self._max_right and right < old[2]) or
+                    (old[3] == self._max_bottom and bottom < old[3])):
+            self._extents_dirty = True
+        elif not self._extents_dirty:
+            if len(self._widget_extents) == 1:
+                self._min_left, self._min_top = x, y
+            else:
+                self._min_left = min(self._min_left, x)
+                self._min_top = min(self._min_top, y)
+            self._max_right = max(self._max_right, right)
+            self._max_bottom = max(self._max_bottom, bottom)
+    
+    def _forget_extents(self, widget_id: str):
+        """Drop a deleted widget from the cached extents"""
+        old = self._widget_extents.pop(widget_id, None)
+        if old and (old[0] == self._min_left or old[1] == self._min_top or
+                    old[2] == self._max_right or old[3] == self._max_bottom):
+            self._extents_dirty = True
+    
+    def get_widget_bounds(self) -> tuple:
+        """Return the smallest left/top and largest right/bottom edge of all widgets"""
+        # Rescan if a bound was lost or the widget dict was changed behind our back
+        if self._extents_dirty or len(self._widget_extents) != len(self.widgets):
+            self._widget_extents = {
+                widget_id: (widget.x, widget.y, widget.x + widget.width, widget.y + widget.height)
+                for widget_id, widget in self.widgets.items()
+            }
+            extents = self._widget_extents.values()
+            self._min_left = min((edges[0] for edges in extents), default=0)
+            self._min_top = min((edges[1] for edges in extents), default=0)
+            self._max_right = max((edges[2] for edges in extents), default=0)
+            self._max_bottom = max((edges[3] for edges in extents), default=0)
+            self._extents_dirty = False
+        return self._min_left, self._min_top, self._max_right, self._max_bottom
+    
+    def get_widget_extents(self) -> tuple:
+        """Return the largest right and bottom edge of all widgets"""
+        return self.get_widget_bounds()[2:]
+    
+    def find_widgets_outside_boundary(self, window_width: int, window_height: int) -> List[WidgetData]:
+        """Return the widgets that extend past the window boundary"""
+        # The cached bounds answer the common case of everything fitting without a scan
+        left, top, right, bottom = self.get_widget_bounds()
+        if left >= 0 and top >= 0 and right <= window_width and bottom <= window_height:
+            return []
         
         outside_widgets = []
         for widget_id, widget_data in self.widgets.items():
@@ -164,6 +515,16 @@ class DesignCanvas(ctk.CTkCanvas):
                 widget_data.x + widget_data.width > window_width or 
                 widget_data.y + widget_data.height > window_height):
                 outside_widgets.append(widget_data)
+        return outside_widgets
+    
+    def check_widgets_outside_boundary(self, window_width: int, window_height: int,
+                                       outside_widgets: Optional[List[WidgetData]] = None):
+        """Check for widgets outside the window boundary and show warnings"""
+        # Remove existing warnings
+        self.delete("boundary_warning")
+        
+        if outside_widgets is None:
+            outside_widgets = self.find_widgets_outside_boundary(window_width, window_height)
         
         if outside_widgets:
             # Show warning message
@@ -190,7 +551,7 @@ class DesignCanvas(ctk.CTkCanvas):
     
     def add_widget(self, widget_type: WidgetType, x: int, y: int):
         """Add a new widget to the canvas"""
-        widget_id = str(uuid.uuid4())
+        widget_id = uuid.uuid4().hex
         
         # Default properties for each widget type
         default_properties = self.get_default_properties(widget_type)
@@ -208,106 +569,194 @@ class DesignCanvas(ctk.CTkCanvas):
         self.widgets[widget_id] = widget_data
         self.render_widget(widget_data)
         self.select_widget(widget_id)
+        self.push_history(HistoryEntry('add', widget_id, None, widget_data.to_dict()))
         # Ensure canvas has focus for keyboard events
         self.focus_set()
         
-        # Mark project as modified
-        main_app = self.winfo_toplevel()
-        if hasattr(main_app, 'project_modified'):
-            main_app.project_modified = True
-            main_app.update_status_info()
+        self.mark_modified()
     
     def get_default_properties(self, widget_type: WidgetType) -> Dict[str, WidgetProperty]:
         """Get default properties for a widget type"""
-        properties = {}
-        
-        if widget_type == WidgetType.BUTTON:
-            properties = {
-                "text": WidgetProperty("text", "Button", "str"),
-                "width": WidgetProperty("width", 100, "int"),
-                "height": WidgetProperty("height", 30, "int"),
-                "command": WidgetProperty("command", "", "str"),
-            }
-        elif widget_type == WidgetType.LABEL:
-            properties = {
-                "text": WidgetProperty("text", "Label", "str"),
-                "width": WidgetProperty("width", 100, "int"),
-                "height": WidgetProperty("height", 30, "int"),
-                "font_size": WidgetProperty("font_size", 12, "int"),
-            }
-        elif widget_type == WidgetType.ENTRY:
-            properties = {
-                "placeholder": WidgetProperty("placeholder", "Enter text...", "str"),
-                "width": WidgetProperty("width", 100, "int"),
-                "height": WidgetProperty("height", 30, "int"),
-            }
-        elif widget_type == WidgetType.CHECKBOX:
-            properties = {
-                "text": WidgetProperty("text", "Checkbox", "str"),
-                "checked": WidgetProperty("checked", False, "bool"),
-                "width": WidgetProperty("width", 100, "int"),
-                "height": WidgetProperty("height", 30, "int"),
-            }
-        elif widget_type == WidgetType.COMBOBOX:
-            properties = {
-                "values": WidgetProperty("values", "Option 1,Option 2,Option 3", "str"),
-                "width": WidgetProperty("width", 100, "int"),
-                "height": WidgetProperty("height", 30, "int"),
-            }
-        elif widget_type == WidgetType.SLIDER:
-            properties = {
-                "from_": WidgetProperty("from_", 0, "int"),
-                "to": WidgetProperty("to", 100, "int"),
-                "value": WidgetProperty("value", 50, "int"),
-                "width": WidgetProperty("width", 200, "int"),
-                "height": WidgetProperty("height", 20, "int"),
-            }
-        elif widget_type == WidgetType.PROGRESSBAR:
-            properties = {
-                "mode": WidgetProperty("mode", "determinate", "list", ["determinate", "indeterminate"]),
-                "value": WidgetProperty("value", 50, "int"),
-                "width": WidgetProperty("width", 200, "int"),
-                "height": WidgetProperty("height", 20, "int"),
-            }
-        
-        return properties
+        return _properties_from_rows(_DEFAULT_PROPERTY_ROWS.get(widget_type, ()))
     
     def render_widget(self, widget_data: WidgetData):
         """Render a widget on the canvas with performance optimization"""
         # Add to render queue for batched processing
-        if widget_data.id not in self.render_queue:
-            self.render_queue.append(widget_data.id)
+        self.render_queue[widget_data.id] = None
         
-        # Schedule batched render if not already scheduled
-        if not self.render_scheduled:
+        # Schedule batched render if not already scheduled, or leave it to the enclosing batch
+        if not self.render_scheduled and not self._batch_depth:
             self.render_scheduled = True
-            self.after_idle(self.batched_render)
+            self._render_after_id = self.after_idle(self.batched_render)
+    
+    @contextmanager
+    def batch_updates(self):
+        """Collect the renders requested inside the block and draw them once when it ends"""
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self.render_queue:
+                if self.render_scheduled:
+                    self.after_cancel(self._render_after_id)
+                self.batched_render()
+    
+    def flush_render(self):
+        """Run any pending batched render now instead of waiting for idle time"""
+        if self.render_scheduled:
+            self.after_cancel(self._render_after_id)
+            self.batched_render()
     
     def batched_render(self):
         """Render all queued widgets in a single batch"""
         self.render_scheduled = False
-        
-        # Process all queued widgets
-        for widget_id in self.render_queue:
-            if widget_id in self.widgets:
-                self.render_single_widget(self.widgets[widget_id])
+        self._render_after_id = None
+        self._render_queued()
         
         # Clear the queue
         self.render_queue.clear()
         
+        # Defer the boundary passes until the mouse is released
+        if self.canvas_interacting:
+            self._boundary_stale = True
+            return
+        
         # Draw window boundary after rendering widgets
         self.draw_window_boundary()
     
-    def render_single_widget(self, widget_data: WidgetData):
-        """Render a single widget on the canvas"""
-        # Remove existing widget representation and handles
-        self.delete(f"widget_{widget_data.id}")
-        self.delete(f"handle_{widget_data.id}")
+    def _render_queued(self):
+        """Draw every queued widget that lies inside the visible area"""
+        # Visible area in canvas coordinates, unknown until the canvas is first laid out
+        cull = self._cw > 1 and self._ch > 1
+        if cull:
+            view_left, view_top = self.canvasx(0), self.canvasy(0)
+            view_right, view_bottom = self.canvasx(self._cw), self.canvasy(self._ch)
+        
+        # Process all queued widgets, skipping those entirely outside the view
+        fresh = {}
+        for widget_id in self.render_queue:
+            widget = self.widgets.get(widget_id)
+            if widget is None:
+                continue
+            if cull and (widget.x > view_right or widget.x + widget.width < view_left or
+                         widget.y > view_bottom or widget.y + widget.height < view_top):
+                self.cull_widget(widget)
+            else:
+                self._culled.discard(widget_id)
+                if self.render_single_widget(widget):
+                    fresh[widget_id] = len(fresh)
+        
+        # Newly created items land on top, so put them back in dict order for hit-testing
+        if fresh:
+            self._restack_drawn(fresh)
+            self._boundary_covered = True
+    
+    def render_all_widgets(self):
+        """Render every widget from scratch, e.g. after loading a project"""
+        if self.render_scheduled:
+            self.after_cancel(self._render_after_id)
+            self.render_scheduled = False
+            self._render_after_id = None
+        for widget_id in self.widgets:
+            self.render_queue[widget_id] = None
+        
+        # One pass over every widget, with the boundary drawn once at the end
+        try:
+            self._render_queued()
+        finally:
+            self.render_queue.clear()
+        self.draw_window_boundary()
+    
+    def _create_widget_item(self, kind: str, *coords, **opts):
+        """Create one item of a widget's drawing, patching its previous item of the same kind"""
+        # Re-renders move and restyle the widget's existing items instead of recreating them
+        reuse = self._item_reuse
+        if reuse and reuse[-1][0] == kind:
+            item = reuse.pop()[1]
+            self.coords(item, *coords)
+            self.itemconfigure(item, **opts)
+        else:
+            item = getattr(self, f"create_{kind}")(*coords, **opts)
+        if self._item_record is not None:
+            self._item_record.append((kind, item))
+        return item
+    
+    def restack_widgets(self):
+        """Raise widget items into dict order without recreating them"""
+        for widget_id in self.widgets:
+            self.tag_raise(self.item_tags(widget_id)[0][0])
+        self._raise_boundary()
+        self.tag_raise("handle")
+        self.tag_lower("grid")
+    
+    def _restack_drawn(self, drawn: Dict[str, int]):
+        """Lower freshly drawn widgets below the next drawn widget in dict order"""
+        # drawn maps each widget to the order its items were created in, all above the older items
+        widget_items = self._widget_items
+        pending = len(drawn)
+        successor = None
+        successor_in_place = False
+        for widget_id in reversed(self.widgets):
+            order = drawn.get(widget_id)
+            if order is not None:
+                # Items created later already sit above, so a chain drawn in dict order needs no moves
+                in_place = successor is None or (successor_in_place and drawn[successor] > order)
+                if not in_place:
+                    self.tag_lower(self.item_tags(widget_id)[0][0], self.item_tags(successor)[0][0])
+                pending -= 1
+                if not pending:
+                    return
+                successor, successor_in_place = widget_id, in_place
+            elif widget_items.get(widget_id):
+                successor, successor_in_place = widget_id, False
+    
+    def item_tags(self, widget_id: str) -> tuple:
+        """Return the canvas tags used for a widget's items and its resize handles"""
+        # Each entry pairs the per-widget tag with a class tag shared by all widgets
+        tags = self._item_tags.get(widget_id)
+        if tags is None:
+            tags = self._item_tags[widget_id] = ((f"widget_{widget_id}", "widget"),
+                                                 (f"handle_{widget_id}", "handle"))
+        return tags
+    
+    def render_single_widget(self, widget_data: WidgetData) -> bool:
+        """Render a single widget on the canvas, returning True if its items were created afresh"""
+        tag = self.item_tags(widget_data.id)[0]
+        if self._handles_owner == widget_data.id:
+            self.release_selection_handles()
         
-        # Create widget representation
         x, y = widget_data.x, widget_data.y
         w, h = widget_data.width, widget_data.height
+        self._track_extents(widget_data.id, x, y, x + w, y + h)
+        self._index_widget(widget_data.id, x, y, w, h)
+        
+        # Patch the existing items in place, falling back to a fresh set if the layout changed
+        previous = self._widget_items.pop(widget_data.id, None)
+        self._item_record = []
+        fresh = previous is None
+        if previous is not None:
+            self._item_reuse = previous[::-1]
+            self.draw_widget_items(widget_data, tag, x, y, w, h)
+            self._item_reuse = None
+            if [kind for kind, _ in self._item_record] != [kind for kind, _ in previous]:
+                self.delete(tag[0])
+                self._item_record = []
+                self.draw_widget_items(widget_data, tag, x, y, w, h)
+                fresh = True
+        else:
+            self.delete(tag[0])
+            self.draw_widget_items(widget_data, tag, x, y, w, h)
+        self._widget_items[widget_data.id] = self._item_record
+        self._item_record = None
         
+        # Selection handles (only for selected widget)
+        if widget_data.id == self.selected_widget_id:
+            self.draw_selection_handles(widget_data)
+        return fresh
+    
+    def draw_widget_items(self, widget_data: WidgetData, tag, x: int, y: int, w: int, h: int):
+        """Draw the rectangle, details and label that represent a widget"""
         # Get widget-specific colors and styling
         widget_colors = self.get_widget_colors(widget_data)
         
@@ -318,12 +767,12 @@ class DesignCanvas(ctk.CTkCanvas):
             fill_color = "#0066cc"
             outline_color = "#ffffff"
         
-        rect = self.create_rectangle(
+        self._create_widget_item("rectangle",
             x, y, x + w, y + h,
             fill=fill_color,
             outline=outline_color,
             width=2,
-            tags=f"widget_{widget_data.id}"
+            tags=tag
         )
         
         # Add widget-specific visual elements
@@ -331,137 +780,149 @@ class DesignCanvas(ctk.CTkCanvas):
         
         # Widget label
         label_text = self.get_widget_display_text(widget_data)
-        self.create_text(
+        self._create_widget_item("text",
             x + w//2, y + h//2,
             text=label_text,
             fill="white",
             font=("Arial", 10),
-            tags=f"widget_{widget_data.id}"
+            tags=tag
         )
+    
+    def cull_widget(self, widget_data: WidgetData):
+        """Drop an off-screen widget's items while keeping its bounds current"""
+        self.delete(self.item_tags(widget_data.id)[0][0])
+        self._widget_items.pop(widget_data.id, None)
+        if self._handles_owner == widget_data.id:
+            self.release_selection_handles()
         
-        # Selection handles (only for selected widget)
-        if widget_data.id == self.selected_widget_id:
-            self.draw_selection_handles(widget_data)
+        x, y = widget_data.x, widget_data.y
+        w, h = widget_data.width, widget_data.height
+        self._track_extents(widget_data.id, x, y, x + w, y + h)
+        self._index_widget(widget_data.id, x, y, w, h)
+        self._culled.add(widget_data.id)
+    
+    def render_widget_move(self, widget_data: WidgetData, dx: int, dy: int):
+        """Move an already rendered widget and its handles by an offset"""
+        tag, handle_tag = self.item_tags(widget_data.id)
+        self.move(tag[0], dx, dy)
+        self.move(handle_tag[0], dx, dy)
+        
+        x, y = widget_data.x, widget_data.y
+        w, h = widget_data.width, widget_data.height
+        self._track_extents(widget_data.id, x, y, x + w, y + h)
+        self._index_widget(widget_data.id, x, y, w, h)
+        
+        # Boundary passes catch up once the interaction ends
+        if self.canvas_interacting:
+            self._boundary_stale = True
+        else:
+            self.draw_window_boundary()
     
     def get_widget_display_text(self, widget_data: WidgetData) -> str:
         """Get display text for widget"""
-        # Use string comparison to be more reliable
-        widget_type_str = widget_data.type.value
-        
-        if widget_type_str == "Button":
-            return widget_data.properties["text"].value
-        elif widget_type_str == "Label":
-            return widget_data.properties["text"].value
-        elif widget_type_str == "Entry":
-            return widget_data.properties["placeholder"].value
-        elif widget_type_str == "Checkbox":
-            return widget_data.properties["text"].value
-        elif widget_type_str == "Combobox":
-            return "Combobox"
-        elif widget_type_str == "Slider":
-            return f"Slider ({widget_data.properties['value'].value})"
-        elif widget_type_str == "Progressbar":
-            return f"Progress ({widget_data.properties['value'].value}%)"
-        
-        return widget_data.type.value
+        display_text = _WIDGET_DISPLAY_TEXT.get(widget_data.type)
+        if display_text is None:
+            return widget_data.type.value
+        return display_text(widget_data.properties)
     
     def get_widget_colors(self, widget_data: WidgetData) -> Dict[str, str]:
         """Get widget-specific colors"""
-        widget_type_str = widget_data.type.value
-        
-        if widget_type_str == "Button":
-            return {"fill": "#2d5a27", "outline": "#4a7c59"}  # Green tones
-        elif widget_type_str == "Label":
-            return {"fill": "#2b2b2b", "outline": "#666666"}  # Dark gray
-        elif widget_type_str == "Entry":
-            return {"fill": "#1a1a1a", "outline": "#555555"}  # Very dark
-        elif widget_type_str == "Checkbox":
-            return {"fill": "#3d2d5a", "outline": "#6a4c93"}  # Purple tones
-        elif widget_type_str == "Combobox":
-            return {"fill": "#2d4a5a", "outline": "#4a7c8a"}  # Blue-gray
-        elif widget_type_str == "Slider":
-            return {"fill": "#5a2d2d", "outline": "#8a4a4a"}  # Red tones
-        elif widget_type_str == "Progressbar":
-            return {"fill": "#2d5a2d", "outline": "#4a7c4a"}  # Green tones
-        else:
-            return {"fill": "#4a4a4a", "outline": "#666666"}  # Default gray
+        return _WIDGET_COLORS.get(widget_data.type, _DEFAULT_WIDGET_COLORS)
     
     def add_widget_specific_elements(self, widget_data: WidgetData, x: int, y: int, w: int, h: int):
         """Add widget-specific visual elements"""
-        widget_type_str = widget_data.type.value
-        
-        if widget_type_str == "Button":
-            # Add a subtle 3D effect for buttons
-            self.create_line(x+1, y+1, x+w-1, y+1, fill="#ffffff", width=1, tags=f"widget_{widget_data.id}")
-            self.create_line(x+1, y+1, x+1, y+h-1, fill="#ffffff", width=1, tags=f"widget_{widget_data.id}")
-            self.create_line(x+w-1, y+1, x+w-1, y+h-1, fill="#000000", width=1, tags=f"widget_{widget_data.id}")
-            self.create_line(x+1, y+h-1, x+w-1, y+h-1, fill="#000000", width=1, tags=f"widget_{widget_data.id}")
-            
-        elif widget_type_str == "Entry":
-            # Add a subtle border effect for entry fields
-            self.create_rectangle(x+2, y+2, x+w-2, y+h-2, outline="#888888", width=1, fill="", tags=f"widget_{widget_data.id}")
-            
-        elif widget_type_str == "Checkbox":
-            # Add a small square for checkbox
-            checkbox_size = min(12, h-4)
-            checkbox_x = x + 4
-            checkbox_y = y + (h - checkbox_size) // 2
-            self.create_rectangle(checkbox_x, checkbox_y, checkbox_x + checkbox_size, checkbox_y + checkbox_size, 
-                                fill="#ffffff", outline="#000000", width=1, tags=f"widget_{widget_data.id}")
-            
-        elif widget_type_str == "Combobox":
-            # Add a dropdown arrow
-            arrow_size = 6
-            arrow_x = x + w - 12
-            arrow_y = y + h // 2
-            self.create_polygon(arrow_x, arrow_y - arrow_size//2, 
-                               arrow_x + arrow_size, arrow_y - arrow_size//2,
-                               arrow_x + arrow_size//2, arrow_y + arrow_size//2,
-                               fill="#ffffff", outline="#000000", width=1, tags=f"widget_{widget_data.id}")
-            
-        elif widget_type_str == "Slider":
-            # Add a track line and thumb
-            track_y = y + h // 2
-            self.create_line(x + 5, track_y, x + w - 5, track_y, fill="#666666", width=2, tags=f"widget_{widget_data.id}")
-            # Thumb position based on value
-            value = widget_data.properties.get("value", WidgetProperty("value", 50, "int")).value
-            from_val = widget_data.properties.get("from_", WidgetProperty("from_", 0, "int")).value
-            to_val = widget_data.properties.get("to", WidgetProperty("to", 100, "int")).value
-            if to_val > from_val:
-                thumb_x = x + 5 + int((value - from_val) / (to_val - from_val) * (w - 10))
-                self.create_oval(thumb_x - 4, track_y - 4, thumb_x + 4, track_y + 4, 
-                                fill="#ffffff", outline="#000000", width=1, tags=f"widget_{widget_data.id}")
-            
-        elif widget_type_str == "Progressbar":
-            # Add progress fill
-            value = widget_data.properties.get("value", WidgetProperty("value", 50, "int")).value
-            fill_width = int((value / 100) * (w - 4))
-            if fill_width > 0:
-                self.create_rectangle(x + 2, y + 2, x + 2 + fill_width, y + h - 2, 
-                                    fill="#4CAF50", outline="", tags=f"widget_{widget_data.id}")
+        draw_extras = self._extra_drawers.get(widget_data.type)
+        if draw_extras is not None:
+            draw_extras(widget_data, x, y, w, h, self.item_tags(widget_data.id)[0])
+    
+    def _draw_button_extras(self, widget_data: WidgetData, x: int, y: int, w: int, h: int, tag):
+        """Add a subtle 3D effect for buttons"""
+        # One polyline for the light top/left edges and one for the dark bottom/right edges
+        self._create_widget_item("line", x+1, y+h-1, x+1, y+1, x+w-1, y+1, fill="#ffffff", width=1, tags=tag)
+        self._create_widget_item("line", x+1, y+h-1, x+w-1, y+h-1, x+w-1, y+1, fill="#000000", width=1, tags=tag)
+    
+    def _draw_entry_extras(self, widget_data: WidgetData, x: int, y: int, w: int, h: int, tag):
+        """Add a subtle border effect for entry fields"""
+        self._create_widget_item("rectangle", x+2, y+2, x+w-2, y+h-2, outline="#888888", width=1, fill="", tags=tag)
+    
+    def _draw_checkbox_extras(self, widget_data: WidgetData, x: int, y: int, w: int, h: int, tag):
+        """Add a small square for checkbox"""
+        checkbox_size = min(12, h-4)
+        checkbox_x = x + 4
+        checkbox_y = y + (h - checkbox_size) // 2
+        self._create_widget_item("rectangle", checkbox_x, checkbox_y, checkbox_x + checkbox_size, checkbox_y + checkbox_size, 
+                            fill="#ffffff", outline="#000000", width=1, tags=tag)
+    
+    def _draw_combobox_extras(self, widget_data: WidgetData, x: int, y: int, w: int, h: int, tag):
+        """Add a dropdown arrow"""
+        arrow_size = 6
+        arrow_x = x + w - 12
+        arrow_y = y + h // 2
+        self._create_widget_item("polygon", arrow_x, arrow_y - arrow_size//2, 
+                           arrow_x + arrow_size, arrow_y - arrow_size//2,
+                           arrow_x + arrow_size//2, arrow_y + arrow_size//2,
+                           fill="#ffffff", outline="#000000", width=1, tags=tag)
+    
+    def _draw_slider_extras(self, widget_data: WidgetData, x: int, y: int, w: int, h: int, tag):
+        """Add a track line and thumb"""
+        track_y = y + h // 2
+        self._create_widget_item("line", x + 5, track_y, x + w - 5, track_y, fill="#666666", width=2, tags=tag)
+        # Thumb position based on value
+        fraction = widget_data.value_fraction()
+        if not math.isnan(fraction):
+            thumb_x = x + 5 + int(fraction * (w - 10))
+            self._create_widget_item("oval", thumb_x - 4, track_y - 4, thumb_x + 4, track_y + 4, 
+                            fill="#ffffff", outline="#000000", width=1, tags=tag)
+    
+    def _draw_progressbar_extras(self, widget_data: WidgetData, x: int, y: int, w: int, h: int, tag):
+        """Add progress fill"""
+        fill_width = int(widget_data.value_fraction() * (w - 4))
+        if fill_width > 0:
+            self._create_widget_item("rectangle", x + 2, y + 2, x + 2 + fill_width, y + h - 2, 
+                                fill="#4CAF50", outline="", tags=tag)
+    
+    def handle_positions(self, widget_data: WidgetData) -> tuple:
+        """Return the top-left corner of each resize handle, in _HANDLE_DELTAS order"""
+        # Corner handles only, centred on the widget's corners
+        half = HANDLE_SIZE // 2
+        left, right = widget_data.x - half, widget_data.x + widget_data.width - half
+        top, bottom = widget_data.y - half, widget_data.y + widget_data.height - half
+        return ((left, top), (right, top), (left, bottom), (right, bottom))
     
     def draw_selection_handles(self, widget_data: WidgetData):
         """Draw resize handles for selected widget"""
-        x, y = widget_data.x, widget_data.y
-        w, h = widget_data.width, widget_data.height
-        handle_size = 8
-        
-        # Corner handles only
-        handles = [
-            (x - handle_size//2, y - handle_size//2),  # Top-left
-            (x + w - handle_size//2, y - handle_size//2),  # Top-right
-            (x - handle_size//2, y + h - handle_size//2),  # Bottom-left
-            (x + w - handle_size//2, y + h - handle_size//2),  # Bottom-right
-        ]
+        handle_size = HANDLE_SIZE
+        handle_tag = self.item_tags(widget_data.id)[1]
+        handles = self.handle_positions(widget_data)
         
-        for i, (hx, hy) in enumerate(handles):
-            self.create_rectangle(
-                hx, hy, hx + handle_size, hy + handle_size,
-                fill="#0066cc",
-                outline="#ffffff",
-                width=2,
-                tags=f"handle_{widget_data.id}"
-            )
+        # The four handle items are created once and moved onto whichever widget is selected
+        self.release_selection_handles()
+        if not self._handle_items:
+            self._handle_items = [
+                self.create_rectangle(
+                    0, 0, 0, 0,
+                    fill="#0066cc",
+                    outline="#ffffff",
+                    width=2,
+                    state="hidden",
+                    tags=("handle",)
+                )
+                for _ in handles
+            ]
+        
+        for item, (hx, hy) in zip(self._handle_items, handles):
+            self.coords(item, hx, hy, hx + handle_size, hy + handle_size)
+        self.addtag_withtag(handle_tag[0], "handle")
+        self.itemconfigure("handle", state="normal")
+        self.tag_raise("handle")
+        self._handles_owner = widget_data.id
+    
+    def release_selection_handles(self):
+        """Hide the pooled resize handles and detach them from their widget"""
+        if self._handles_owner is not None:
+            self.itemconfigure("handle", state="hidden")
+            self.dtag("handle", self.item_tags(self._handles_owner)[1][0])
+            self._handles_owner = None
     
     def on_canvas_click(self, event):
         """Handle canvas click events"""
@@ -476,17 +937,8 @@ class DesignCanvas(ctk.CTkCanvas):
             self.select_widget(widget_id)
             widget_data = self.widgets[widget_id]
             # Set resize data with original dimensions
-            self.drag_data = {
-                "x": event.x, 
-                "y": event.y, 
-                "widget": widget_id, 
-                "mode": "resize", 
-                "handle": handle_index,
-                "original_x": widget_data.x,
-                "original_y": widget_data.y,
-                "original_width": widget_data.width,
-                "original_height": widget_data.height
-            }
+            self.drag_data.start(event, widget_data, "resize", handle_index)
+            self._bind_drag_motion()
             return "break"
         
         # Then check if clicking on a widget
@@ -495,49 +947,79 @@ class DesignCanvas(ctk.CTkCanvas):
             self.select_widget(widget_id)
             widget_data = self.widgets[widget_id]
             # Set drag data for potential dragging with proper offset calculation
-            self.drag_data = {
-                "x": event.x, 
-                "y": event.y, 
-                "widget": widget_id, 
-                "mode": "move",
-                "original_x": widget_data.x,
-                "original_y": widget_data.y,
-                "click_offset_x": event.x - widget_data.x,
-                "click_offset_y": event.y - widget_data.y
-            }
+            self.drag_data.start(event, widget_data, "move")
+            self._bind_drag_motion()
             # Stop event propagation to prevent toolbox from responding
             return "break"
         else:
             self.deselect_all()
             # Clear drag data when clicking empty space
-            self.drag_data = {"x": 0, "y": 0, "widget": None, "mode": None}
+            self.drag_data.reset()
+    
+    def _bind_drag_motion(self):
+        """Start receiving motion events for the drag that just began"""
+        # Motion is only bound while a widget is grabbed, so empty-canvas drags cost nothing
+        if self._motion_bind_id is None:
+            self._motion_bind_id = self.bind("<B1-Motion>", self.on_canvas_drag)
+    
+    def _index_widget(self, widget_id: str, x: int, y: int, w: int, h: int):
+        """Place a widget in every spatial hash cell its bounds overlap"""
+        cell = HIT_CELL_SIZE
+        span = (int(x) // cell, int(y) // cell, int(x + w) // cell, int(y + h) // cell)
+        if self._widget_cells.get(widget_id) == span:
+            return
+        
+        self._unindex_widget(widget_id)
+        self._widget_cells[widget_id] = span
+        cell_index = self._cell_index
+        for cx in range(span[0], span[2] + 1):
+            for cy in range(span[1], span[3] + 1):
+                cell_index.setdefault((cx, cy), set()).add(widget_id)
+    
+    def _unindex_widget(self, widget_id: str):
+        """Remove a widget from the spatial hash"""
+        span = self._widget_cells.pop(widget_id, None)
+        if span is None:
+            return
+        
+        cell_index = self._cell_index
+        for cx in range(span[0], span[2] + 1):
+            for cy in range(span[1], span[3] + 1):
+                ids = cell_index.get((cx, cy))
+                if ids is not None:
+                    ids.discard(widget_id)
+                    if not ids:
+                        del cell_index[(cx, cy)]
     
     def find_widget_at_position(self, x: int, y: int) -> Optional[str]:
         """Find widget at given position"""
-        for widget_id, widget_data in self.widgets.items():
+        # Widgets not rendered yet are missing from the index, so scan everything then
+        if len(self._widget_cells) != len(self.widgets):
+            candidates = self.widgets
+        else:
+            candidates = self._cell_index.get((int(x) // HIT_CELL_SIZE, int(y) // HIT_CELL_SIZE), ())
+        
+        hits = []
+        for widget_id in candidates:
+            widget_data = self.widgets[widget_id]
             if (widget_data.x <= x <= widget_data.x + widget_data.width and
                 widget_data.y <= y <= widget_data.y + widget_data.height):
-                return widget_id
-        return None
+                hits.append(widget_id)
+        
+        if len(hits) > 1:
+            # Overlapping widgets resolve to the topmost, which is the latest in stacking order
+            return next(widget_id for widget_id in reversed(self.widgets) if widget_id in hits)
+        return hits[0] if hits else None
     
     def find_handle_at_position(self, x: int, y: int) -> Optional[tuple]:
         """Find resize handle at given position. Returns (widget_id, handle_index) or None"""
         if not self.selected_widget_id:
             return None
             
-        widget_data = self.widgets[self.selected_widget_id]
-        handle_size = 8
-        x_pos, y_pos = widget_data.x, widget_data.y
-        w, h = widget_data.width, widget_data.height
+        handle_size = HANDLE_SIZE
         
         # Check each handle
-        handles = [
-            (x_pos - handle_size//2, y_pos - handle_size//2),  # Top-left
-            (x_pos + w - handle_size//2, y_pos - handle_size//2),  # Top-right
-            (x_pos - handle_size//2, y_pos + h - handle_size//2),  # Bottom-left
-            (x_pos + w - handle_size//2, y_pos + h - handle_size//2),  # Bottom-right
-        ]
-        
+        handles = self.handle_positions(self.widgets[self.selected_widget_id])
         for i, (hx, hy) in enumerate(handles):
             if (hx <= x <= hx + handle_size and hy <= y <= hy + handle_size):
                 return (self.selected_widget_id, i)
@@ -545,77 +1027,123 @@ class DesignCanvas(ctk.CTkCanvas):
     
     def select_widget(self, widget_id: str):
         """Select a widget"""
+        previous_id = self.selected_widget_id
         self.selected_widget_id = widget_id
         self.on_widget_select(self.widgets[widget_id])
-        self.render_widget(self.widgets[widget_id])
+        
+        # Only the old and new selection change appearance
+        if previous_id != widget_id:
+            if previous_id in self.widgets:
+                self.restyle_selection(self.widgets[previous_id])
+            self.restyle_selection(self.widgets[widget_id])
+    
+    def restyle_selection(self, widget_data: WidgetData):
+        """Recolor a widget's rectangle and move the handles after a selection change"""
+        items = self._widget_items.get(widget_data.id)
+        if not items:
+            # Culled or still queued, the widget picks up its selection styling when it is drawn
+            if self._handles_owner == widget_data.id:
+                self.release_selection_handles()
+            if widget_data.id not in self._culled:
+                self.render_widget(widget_data)
+            return
+        
+        # The main rectangle is always the first item drawn for a widget
+        if widget_data.id == self.selected_widget_id:
+            self.itemconfigure(items[0][1], fill="#0066cc", outline="#ffffff")
+            self.draw_selection_handles(widget_data)
+        else:
+            widget_colors = self.get_widget_colors(widget_data)
+            self.itemconfigure(items[0][1], fill=widget_colors["fill"], outline=widget_colors["outline"])
+            if self._handles_owner == widget_data.id:
+                self.release_selection_handles()
     
     def deselect_all(self):
         """Deselect all widgets"""
+        previous_id = self.selected_widget_id
         self.selected_widget_id = None
         self.on_widget_select(None)
-        for widget_data in self.widgets.values():
-            self.render_widget(widget_data)
+        if previous_id in self.widgets:
+            self.restyle_selection(self.widgets[previous_id])
     
     def on_canvas_drag(self, event):
         """Handle canvas drag events"""
-        if self.drag_data["widget"]:
-            widget_id = self.drag_data["widget"]
-            widget_data = self.widgets[widget_id]
-            mode = self.drag_data.get("mode", "move")
+        drag = self.drag_data
+        if drag.widget:
+            # Devices that report sub-pixel motion repeat the same position
+            if event.x == drag.x and event.y == drag.y:
+                return
+            drag.x = event.x
+            drag.y = event.y
+            self.canvas_interacting = True
+            # Only the latest pointer position matters, so apply it at most once per frame
+            self._pending_drag = (event.x, event.y)
+            if self._drag_after_id is None:
+                self._drag_after_id = self.after(self.render_throttle, self._flush_drag)
+    
+    def _flush_drag(self):
+        """Apply the most recent queued drag position"""
+        if self._drag_after_id is not None:
+            self.after_cancel(self._drag_after_id)
+            self._drag_after_id = None
+        
+        if self._pending_drag is not None:
+            x, y = self._pending_drag
+            self._pending_drag = None
+            # Draw the result in this tick rather than in a second idle callback
+            with self.batch_updates():
+                self.apply_drag(x, y)
+    
+    def apply_drag(self, x: int, y: int):
+        """Move or resize the dragged widget to follow the pointer at (x, y)"""
+        drag = self.drag_data
+        if drag.widget:
+            widget_data = self.widgets[drag.widget]
+            mode = drag.mode
             
             if mode == "move":
                 # Handle widget moving - use absolute positioning for smoother movement
                 # Calculate new position relative to the original click position
-                original_x = self.drag_data.get("original_x", widget_data.x)
-                original_y = self.drag_data.get("original_y", widget_data.y)
-                click_offset_x = self.drag_data.get("click_offset_x", 0)
-                click_offset_y = self.drag_data.get("click_offset_y", 0)
-                
-                new_x = event.x - click_offset_x
-                new_y = event.y - click_offset_y
+                new_x = int(x - drag.click_offset_x)
+                new_y = int(y - drag.click_offset_y)
                 
                 # Snap to grid if enabled
                 if self.snap_to_grid:
-                    new_x = round(new_x / self.grid_size) * self.grid_size
-                    new_y = round(new_y / self.grid_size) * self.grid_size
+                    new_x = self.snap(new_x)
+                    new_y = self.snap(new_y)
                 
                 # Update widget position
-                widget_data.x = max(0, new_x)
-                widget_data.y = max(0, new_y)
+                new_x = max(0, new_x)
+                new_y = max(0, new_y)
+                dx = new_x - widget_data.x
+                dy = new_y - widget_data.y
+                if not dx and not dy:  # Still in the same grid cell
+                    return
+                widget_data.x = new_x
+                widget_data.y = new_y
                 
-                # Re-render the widget completely to avoid artifacts
-                self.render_widget(widget_data)
+                # Shift the existing canvas items rather than recreating them
+                self.render_widget_move(widget_data, dx, dy)
                 
             elif mode == "resize":
                 # Handle widget resizing with smooth absolute positioning
-                handle_index = self.drag_data["handle"]
+                handle_index = drag.handle
                 
                 # Get original widget dimensions and position
-                original_x = self.drag_data.get("original_x", widget_data.x)
-                original_y = self.drag_data.get("original_y", widget_data.y)
-                original_width = self.drag_data.get("original_width", widget_data.width)
-                original_height = self.drag_data.get("original_height", widget_data.height)
+                original_x = drag.original_x
+                original_y = drag.original_y
+                original_width = drag.original_width
+                original_height = drag.original_height
                 
                 # Calculate new dimensions based on handle and current mouse position
-                new_x, new_y = original_x, original_y
-                new_width, new_height = original_width, original_height
-                
-                if handle_index == 0:  # Top-left
-                    new_x = event.x
-                    new_y = event.y
-                    new_width = original_width + (original_x - event.x)
-                    new_height = original_height + (original_y - event.y)
-                elif handle_index == 1:  # Top-right
-                    new_y = event.y
-                    new_width = event.x - original_x
-                    new_height = original_height + (original_y - event.y)
-                elif handle_index == 2:  # Bottom-left
-                    new_x = event.x
-                    new_width = original_width + (original_x - event.x)
-                    new_height = event.y - original_y
-                elif handle_index == 3:  # Bottom-right
-                    new_width = event.x - original_x
-                    new_height = event.y - original_y
+                move_x, move_y, width_sign, height_sign = _HANDLE_DELTAS[handle_index]
+                dx = x - original_x
+                dy = y - original_y
+                new_x = original_x + move_x * dx
+                new_y = original_y + move_y * dy
+                # Edges opposite the pointer stay fixed, so the size is kept only when the origin moves
+                new_width = move_x * original_width + width_sign * dx
+                new_height = move_y * original_height + height_sign * dy
                 
                 # Apply minimum size constraints
                 new_width = max(20, new_width)
@@ -623,36 +1151,72 @@ class DesignCanvas(ctk.CTkCanvas):
                 
                 # Snap to grid if enabled
                 if self.snap_to_grid:
-                    new_x = round(new_x / self.grid_size) * self.grid_size
-                    new_y = round(new_y / self.grid_size) * self.grid_size
-                    new_width = round(new_width / self.grid_size) * self.grid_size
-                    new_height = round(new_height / self.grid_size) * self.grid_size
+                    snap = self.snap
+                    new_x = snap(int(new_x))
+                    new_y = snap(int(new_y))
+                    new_width = snap(int(new_width))
+                    new_height = snap(int(new_height))
+                
+                # Nothing to redraw if the snapped geometry did not change
+                new_x = max(0, new_x)
+                new_y = max(0, new_y)
+                if (new_x, new_y, new_width, new_height) == (widget_data.x, widget_data.y,
+                                                             widget_data.width, widget_data.height):
+                    return
                 
                 # Update widget properties
-                widget_data.x = max(0, new_x)
-                widget_data.y = max(0, new_y)
+                widget_data.x = new_x
+                widget_data.y = new_y
                 widget_data.width = new_width
                 widget_data.height = new_height
                 
                 # Update the properties dictionary to reflect the changes
+                self._prop_records.pop(widget_data.id, None)
                 if "width" in widget_data.properties:
                     widget_data.properties["width"].value = new_width
                 if "height" in widget_data.properties:
                     widget_data.properties["height"].value = new_height
                 
-                # Update properties in the properties editor
-                main_app = self.winfo_toplevel()
-                if hasattr(main_app, 'properties_editor'):
-                    main_app.properties_editor.set_widget(widget_data)
-                
                 # Re-render the widget with new dimensions
                 self.render_widget(widget_data)
     
     def on_canvas_release(self, event):
         """Handle canvas release events"""
-        self.drag_data = {"x": 0, "y": 0, "widget": None, "mode": None}
+        self._flush_drag()
+        if self._motion_bind_id is not None:
+            self.unbind("<B1-Motion>", self._motion_bind_id)
+            self._motion_bind_id = None
+        drag = self.drag_data
+        if drag.widget in self.widgets:
+            # Record the whole drag as one undo step
+            widget_data = self.widgets[drag.widget]
+            after = widget_data.to_dict()
+            if after != drag.before:
+                self.push_history(HistoryEntry(drag.mode, drag.widget, drag.before, after))
+                
+                # Show the final size in the properties editor once the resize ends
+                if drag.mode == "resize" and self.properties_editor is not None:
+                    self.properties_editor.set_widget(widget_data)
+        drag.reset()
+        
+        # Run the boundary passes skipped while dragging once
+        if self._boundary_stale:
+            self._boundary_stale = False
+            self.after_idle(self.draw_window_boundary)
+        
         # Reset the interaction flag after a short delay
-        self.after(100, lambda: setattr(self, 'canvas_interacting', False))
+        if self._interacting_after:
+            self.after_cancel(self._interacting_after)
+        self._interacting_after = self.after(100, self._clear_interacting)
+    
+    def _clear_interacting(self):
+        """End the current canvas interaction"""
+        self.canvas_interacting = False
+        self._interacting_after = None
+        
+        # Catch up on boundary passes skipped since the release
+        if self._boundary_stale:
+            self.draw_window_boundary()
     
     def on_right_click(self, event):
         """Handle right-click context menu"""
@@ -662,118 +1226,165 @@ class DesignCanvas(ctk.CTkCanvas):
     
     def show_context_menu(self, x: int, y: int, widget_id: str):
         """Show context menu for widget"""
-        context_menu = tk.Menu(self, tearoff=0)
-        context_menu.add_command(label="Delete", command=lambda: self.delete_widget(widget_id))
-        context_menu.add_command(label="Duplicate", command=lambda: self.duplicate_widget(widget_id))
-        context_menu.add_command(label="Bring to Front", command=lambda: self.bring_to_front(widget_id))
-        context_menu.add_command(label="Send to Back", command=lambda: self.send_to_back(widget_id))
-        
+        self._ctx_target = widget_id
         try:
-            context_menu.tk_popup(x, y)
+            self._ctx_menu.tk_popup(x, y)
         finally:
-            context_menu.grab_release()
+            self._ctx_menu.grab_release()
+    
+    def _ctx_delete(self):
+        """Context menu: delete the targeted widget"""
+        self.delete_widget(self._ctx_target)
+    
+    def _ctx_duplicate(self):
+        """Context menu: duplicate the targeted widget"""
+        self.duplicate_widget(self._ctx_target)
+    
+    def _ctx_bring_to_front(self):
+        """Context menu: raise the targeted widget"""
+        self.bring_to_front(self._ctx_target)
+    
+    def _ctx_send_to_back(self):
+        """Context menu: lower the targeted widget"""
+        self.send_to_back(self._ctx_target)
     
     def delete_widget(self, widget_id: str):
         """Delete a widget"""
         if widget_id in self.widgets:
-            del self.widgets[widget_id]
-            self.delete(f"widget_{widget_id}")
-            self.delete(f"handle_{widget_id}")
-            if self.selected_widget_id == widget_id:
-                self.deselect_all()
+            # Remember the stacking position so undo can put the widget back where it was
+            before = {**self.widgets[widget_id].to_dict(), 'index': list(self.widgets).index(widget_id)}
+            self.push_history(HistoryEntry('delete', widget_id, before, None))
+            self.remove_widget(widget_id)
             
-            # Mark project as modified
-            main_app = self.winfo_toplevel()
-            if hasattr(main_app, 'project_modified'):
-                main_app.project_modified = True
-                main_app.update_status_info()
+            self.mark_modified()
+    
+    def mark_modified(self):
+        """Flag the project as modified and refresh the status bar shortly after"""
+        main_app = self.main_app
+        if hasattr(main_app, 'project_modified'):
+            main_app.project_modified = True
+            # Bursts of edits collapse into a single status bar update
+            if self._status_after_id is None:
+                self._status_after_id = self.after(100, self._flush_status)
+    
+    def _flush_status(self):
+        """Refresh the status bar after a burst of modifications"""
+        self._status_after_id = None
+        self.app_function('update_status_info')()
+    
+    def remove_widget(self, widget_id: str):
+        """Remove a widget and its canvas items without recording history"""
+        del self.widgets[widget_id]
+        self._forget_extents(widget_id)
+        self._unindex_widget(widget_id)
+        if self._handles_owner == widget_id:
+            self.release_selection_handles()
+        self.delete(self.item_tags(widget_id)[0][0])
+        del self._item_tags[widget_id]
+        self._widget_items.pop(widget_id, None)
+        self._culled.discard(widget_id)
+        if self.selected_widget_id == widget_id:
+            self.deselect_all()
+    
+    def clear_widgets(self):
+        """Remove every widget from the canvas, leaving the grid in place"""
+        self.widgets.clear()
+        self.render_queue.clear()
+        self.delete("widget")
+        self.release_selection_handles()
+        self.delete("boundary_warning")
+        self._boundary_state = None
+        self._item_tags.clear()
+        self._prop_records.clear()
+        self._cell_index.clear()
+        self._widget_cells.clear()
+        self._culled.clear()
+        self._widget_items.clear()
+        self._widget_extents.clear()
+        self._extents_dirty = True
+        self.draw_window_boundary()
     
     def duplicate_widget(self, widget_id: str):
         """Duplicate a widget"""
         if widget_id in self.widgets:
-            original = self.widgets[widget_id]
-            new_widget = WidgetData(
-                id=str(uuid.uuid4()),
-                type=original.type,
-                x=original.x + 20,
-                y=original.y + 20,
-                width=original.width,
-                height=original.height,
-                properties=original.properties.copy()
-            )
+            # Build from the serialized record so the copy gets its own WidgetProperty objects
+            new_widget = self.widget_from_record(self.widgets[widget_id].to_dict())
+            new_widget.id = uuid.uuid4().hex
+            new_widget.x += 20
+            new_widget.y += 20
             self.widgets[new_widget.id] = new_widget
             self.render_widget(new_widget)
+            self.push_history(HistoryEntry('add', new_widget.id, None, new_widget.to_dict()))
+    
+    def _reorder_widgets(self, order):
+        """Put the widgets dict into the given id order"""
+        # Refill in place, other components hold on to this dict
+        widgets = self.widgets
+        ordered = [(widget_id, widgets[widget_id]) for widget_id in order]
+        widgets.clear()
+        widgets.update(ordered)
     
     def bring_to_front(self, widget_id: str):
         """Bring widget to front"""
         if widget_id in self.widgets:
-            # Re-render to bring to front
-            self.render_widget(self.widgets[widget_id])
+            # Keep dict order in step with stacking order for later re-renders
+            self.widgets[widget_id] = self.widgets.pop(widget_id)
+            tag, handle_tag = self.item_tags(widget_id)
+            self.tag_raise(tag[0])
+            self._raise_boundary()
+            self.tag_raise(handle_tag[0])
     
     def send_to_back(self, widget_id: str):
         """Send widget to back"""
         if widget_id in self.widgets:
-            # Re-render all widgets to send to back
-            for wd in self.widgets.values():
-                self.render_widget(wd)
+            self._reorder_widgets([widget_id, *(other for other in self.widgets if other != widget_id)])
+            self.tag_lower(self.item_tags(widget_id)[0][0])
+            # The grid must stay underneath every widget
+            self.tag_lower("grid")
     
     def on_delete_key(self, event):
         """Handle delete key press"""
         if self.selected_widget_id:
-            self.save_state()  # Save state before deletion
             self.delete_widget(self.selected_widget_id)
-            if self.status_bar:
-                self.status_bar.configure(text="Widget deleted")
+            self.set_status("Widget deleted")
         return "break"
     
     def on_copy(self, event):
         """Copy selected widget to clipboard"""
         if self.selected_widget_id:
-            widget_data = self.widgets[self.selected_widget_id]
-            self.clipboard = widget_data
-            if self.status_bar:
-                self.status_bar.configure(text="Widget copied to clipboard")
+            # Store a serialized copy so later edits don't leak into pastes
+            self.clipboard = self.widgets[self.selected_widget_id].to_dict()
+            self.set_status("Widget copied to clipboard")
         return "break"
     
     def on_cut(self, event):
         """Cut selected widget to clipboard"""
         if self.selected_widget_id:
-            widget_data = self.widgets[self.selected_widget_id]
-            self.clipboard = widget_data
-            self.save_state()  # Save state before deletion
+            self.clipboard = self.widgets[self.selected_widget_id].to_dict()
             self.delete_widget(self.selected_widget_id)
-            if self.status_bar:
-                self.status_bar.configure(text="Widget cut to clipboard")
+            self.set_status("Widget cut to clipboard")
         return "break"
     
     def on_paste(self, event):
         """Paste widget from clipboard"""
         if self.clipboard:
             # Create a new widget based on clipboard
-            new_widget = WidgetData(
-                id=str(uuid.uuid4()),
-                type=self.clipboard.type,
-                x=self.clipboard.x + 20,  # Offset slightly
-                y=self.clipboard.y + 20,
-                width=self.clipboard.width,
-                height=self.clipboard.height,
-                properties=self.clipboard.properties.copy()
-            )
-            self.save_state()  # Save state before adding
+            new_widget = self.widget_from_record(self.clipboard)
+            new_widget.id = uuid.uuid4().hex
+            new_widget.x += 20  # Offset slightly
+            new_widget.y += 20
             self.widgets[new_widget.id] = new_widget
             self.render_widget(new_widget)
             self.select_widget(new_widget.id)
-            if self.status_bar:
-                self.status_bar.configure(text="Widget pasted from clipboard")
+            self.push_history(HistoryEntry('add', new_widget.id, None, new_widget.to_dict()))
+            self.set_status("Widget pasted from clipboard")
         return "break"
     
     def on_duplicate(self, event):
         """Duplicate selected widget"""
         if self.selected_widget_id:
-            self.save_state()  # Save state before duplication
             self.duplicate_widget(self.selected_widget_id)
-            if self.status_bar:
-                self.status_bar.configure(text="Widget duplicated")
+            self.set_status("Widget duplicated")
         return "break"
     
     def on_select_all(self, event):
@@ -781,151 +1392,271 @@ class DesignCanvas(ctk.CTkCanvas):
         if self.widgets:
             # For now, just select the first widget
             # In a full implementation, you'd select all widgets
-            first_widget_id = list(self.widgets.keys())[0]
+            first_widget_id = next(iter(self.widgets))
             self.select_widget(first_widget_id)
-            if self.status_bar:
-                self.status_bar.configure(text="Widget selected")
+            self.set_status("Widget selected")
         return "break"
     
     def on_undo(self, event):
         """Undo last action"""
+        self._commit_prop_edit()
         if self.undo_stack:
-            self.save_state_to_redo()
-            state = self.undo_stack.pop()
-            self.restore_state(state)
-            if self.status_bar:
-                self.status_bar.configure(text="Action undone")
+            entry = self.undo_stack.pop()
+            self.apply_history(entry, undo=True)
+            self.redo_stack.append(entry)
+            self.set_status("Action undone")
         return "break"
     
     def on_redo(self, event):
         """Redo last undone action"""
+        self._commit_prop_edit()
         if self.redo_stack:
-            self.save_state_to_undo()
-            state = self.redo_stack.pop()
-            self.restore_state(state)
-            if self.status_bar:
-                self.status_bar.configure(text="Action redone")
+            entry = self.redo_stack.pop()
+            self.apply_history(entry, undo=False)
+            self.undo_stack.append(entry)
+            self.set_status("Action redone")
         return "break"
     
     def on_save(self, event):
         """Save project"""
-        main_app = self.winfo_toplevel()
-        if hasattr(main_app, 'save_project'):
-            main_app.save_project()
-            if self.status_bar:
-                self.status_bar.configure(text="Project saved")
+        save_project = self.app_function('save_project')
+        if save_project:
+            save_project()
+            self.set_status("Project saved")
         return "break"
     
     def on_new(self, event):
         """New project"""
-        main_app = self.winfo_toplevel()
-        if hasattr(main_app, 'new_project'):
-            main_app.new_project()
-            if self.status_bar:
-                self.status_bar.configure(text="New project created")
+        new_project = self.app_function('new_project')
+        if new_project:
+            new_project()
+            self.set_status("New project created")
         return "break"
     
     def on_open(self, event):
         """Open project"""
-        main_app = self.winfo_toplevel()
-        if hasattr(main_app, 'open_project'):
-            main_app.open_project()
-            if self.status_bar:
-                self.status_bar.configure(text="Project opened")
+        open_project = self.app_function('open_project')
+        if open_project:
+            open_project()
+            self.set_status("Project opened")
         return "break"
     
     def on_preview(self, event):
         """Preview GUI"""
-        main_app = self.winfo_toplevel()
-        if hasattr(main_app, 'preview_gui'):
-            main_app.preview_gui()
-            if self.status_bar:
-                self.status_bar.configure(text="Preview opened")
+        preview_gui = self.app_function('preview_gui')
+        if preview_gui:
+            preview_gui()
+            self.set_status("Preview opened")
         return "break"
     
     def on_escape(self, event):
         """Escape key - deselect all"""
         self.deselect_all()
-        if self.status_bar:
-            self.status_bar.configure(text="Selection cleared")
+        self.set_status("Selection cleared")
         return "break"
     
-    def save_state(self):
-        """Save current state for undo"""
-        if len(self.undo_stack) >= self.max_undo_steps:
-            self.undo_stack.pop(0)  # Remove oldest state
+    def properties_record(self, widget: WidgetData) -> tuple:
+        """Return an immutable record of a widget's properties, cached until they change"""
+        cached = self._prop_records.get(widget.id)
+        if cached is not None and cached[0] is widget:
+            return cached[1]
         
-        state = {
-            'widgets': {k: v.to_dict() for k, v in self.widgets.items()},
+        # Options are copied to tuples so history entries never share the live property lists
+        record = tuple((k, v.name, v.value, v.type, tuple(v.options) if v.options is not None else None)
+                       for k, v in widget.properties.items())
+        self._prop_records[widget.id] = (widget, record)
+        return record
+    
+    def snapshot_state(self) -> dict:
+        """Capture the canvas as parallel arrays for the undo/redo stacks"""
+        widgets = list(self.widgets.values())
+        geometry = []
+        for widget in widgets:
+            geometry += (widget.x, widget.y, widget.width, widget.height)
+        
+        return {
+            'ids': tuple(widget.id for widget in widgets),
+            'types': tuple(widget.type for widget in widgets),
+            'geometry': tuple(geometry),
+            'properties': tuple(self.properties_record(widget) for widget in widgets),
             'selected_widget_id': self.selected_widget_id
         }
-        self.undo_stack.append(state)
+    
+    def set_status(self, text: str):
+        """Show a message in the status bar, if there is one"""
+        if self.status_bar:
+            self.status_bar.configure(text=text)
+    
+    def save_state(self):
+        """Save a full snapshot for undo, used by bulk operations"""
+        state = self.snapshot_state()
+        # Repeating a bulk operation on an unchanged canvas adds nothing to undo
+        if self.undo_stack:
+            top = self.undo_stack[-1]
+            if top.op == 'snapshot' and top.before == state:
+                return
+        self.push_history(HistoryEntry('snapshot', None, state, None))
+    
+    def push_history(self, entry: HistoryEntry):
+        """Record an undoable change"""
+        # Close any open property edit burst first so history stays in order
+        if self._pending_prop_edit is not None:
+            self._commit_prop_edit()
+        self.undo_stack.append(entry)
         self.redo_stack.clear()  # Clear redo stack when new action is performed
     
-    def save_state_to_undo(self):
-        """Save current state to undo stack"""
-        state = {
-            'widgets': {k: v.to_dict() for k, v in self.widgets.items()},
-            'selected_widget_id': self.selected_widget_id
-        }
-        self.undo_stack.append(state)
+    def apply_history(self, entry: HistoryEntry, undo: bool):
+        """Apply one side of a history entry to the canvas"""
+        if entry.op == 'snapshot':
+            # Capture the state being left so the entry can be replayed the other way
+            if undo:
+                entry.after = self.snapshot_state()
+                self.restore_state(entry.before)
+            else:
+                entry.before = self.snapshot_state()
+                self.restore_state(entry.after)
+            return
+        
+        record = entry.before if undo else entry.after
+        self.apply_widget_record(entry.widget_id, record)
+        
+        self.mark_modified()
     
-    def save_state_to_redo(self):
-        """Save current state to redo stack"""
-        state = {
-            'widgets': {k: v.to_dict() for k, v in self.widgets.items()},
-            'selected_widget_id': self.selected_widget_id
+    def apply_widget_record(self, widget_id: str, record: Optional[dict]):
+        """Bring a single widget in line with a to_dict() record, or remove it if None"""
+        if record is None:
+            if widget_id in self.widgets:
+                self.remove_widget(widget_id)
+            return
+        
+        widget = self.widgets.get(widget_id)
+        if widget is None:
+            widget = self.widget_from_record(record)
+            index = record.get('index')
+            self.widgets[widget_id] = widget
+            if index is not None and index < len(self.widgets) - 1:
+                # Move it back to the recorded stacking position
+                order = list(self.widgets)
+                order.insert(index, order.pop())
+                self._reorder_widgets(order)
+        else:
+            widget.x = record['x']
+            widget.y = record['y']
+            widget.width = record['width']
+            widget.height = record['height']
+            widget.properties = self.widget_from_record(record).properties
+            self._prop_records.pop(widget_id, None)
+        
+        # The render pass lowers a reinserted widget back to its stacking position
+        self.render_widget(widget)
+        self.select_widget(widget_id)
+    
+    def widget_from_record(self, record: dict) -> WidgetData:
+        """Build a WidgetData from a to_dict() record"""
+        widget_property = WidgetProperty
+        properties = {
+            k: widget_property(v['name'], v['value'], v['type'],
+                               list(v['options']) if v.get('options') is not None else None)
+            for k, v in record['properties'].items()
         }
-        self.redo_stack.append(state)
+        return WidgetData(record['id'], _WT_CACHE[record['type']], record['x'], record['y'],
+                          record['width'], record['height'], properties)
     
     def restore_state(self, state):
-        """Restore state from undo/redo stack"""
-        # Clear current widgets
-        self.widgets.clear()
-        self.delete("all")
-        
-        # Restore widgets
-        for widget_data in state['widgets'].values():
-            widget = WidgetData(
-                id=widget_data['id'],
-                type=WidgetType(widget_data['type']),
-                x=widget_data['x'],
-                y=widget_data['y'],
-                width=widget_data['width'],
-                height=widget_data['height'],
-                properties={
-                    k: WidgetProperty(
-                        name=v['name'],
-                        value=v['value'],
-                        type=v['type'],
-                        options=v.get('options')
-                    )
-                    for k, v in widget_data['properties'].items()
-                }
-            )
-            self.widgets[widget.id] = widget
-            self.render_widget(widget)
+        """Restore state from undo/redo stack, re-rendering only widgets that differ"""
+        target_ids = set(state['ids'])
+        
+        # Remove widgets that do not exist in the target state
+        for widget_id in [widget_id for widget_id in self.widgets if widget_id not in target_ids]:
+            self.remove_widget(widget_id)
+        
+        # Add or update the rest, with hot names bound to locals
+        widgets = self.widgets
+        prop_records = self._prop_records
+        properties_record = self.properties_record
+        render = self.render_widget
+        widget_data = WidgetData
+        properties_from_rows = _properties_from_rows
+        geometry = state['geometry']
+        index = 0
+        for widget_id, widget_type, record in zip(state['ids'], state['types'], state['properties']):
+            x, y, width, height = geometry[index:index + 4]
+            index += 4
+            widget = widgets.get(widget_id)
+            
+            if widget is not None and widget.type == widget_type:
+                geometry_changed = (widget.x, widget.y, widget.width, widget.height) != (x, y, width, height)
+                properties_changed = properties_record(widget) != record
+                if not geometry_changed and not properties_changed:
+                    continue
+                
+                widget.x, widget.y, widget.width, widget.height = x, y, width, height
+                if properties_changed:
+                    widget.properties = properties_from_rows(record)
+            else:
+                if widget is not None:
+                    self.remove_widget(widget_id)
+                properties = properties_from_rows(record)
+                widget = widgets[widget_id] = widget_data(widget_id, widget_type, x, y, width, height, properties)
+            
+            # The record still describes the widget exactly, so keep it cached
+            prop_records[widget_id] = (widget, record)
+            render(widget)
         
         # Restore selection
         if state['selected_widget_id'] and state['selected_widget_id'] in self.widgets:
-            self.select_widget(state['selected_widget_id'])
-        else:
+            if state['selected_widget_id'] != self.selected_widget_id:
+                self.deselect_all()
+                self.select_widget(state['selected_widget_id'])
+        elif self.selected_widget_id is not None:
             self.deselect_all()
         
-        self.draw_grid()
+        # Apply every queued change and let Tk repaint once
+        self.flush_render()
+        if tuple(widgets) != state['ids']:
+            self._reorder_widgets(state['ids'])
+            self.restack_widgets()
+        self.update_idletasks()
     
     def update_widget_property(self, widget_id: str, property_name: str, value: Any):
         """Update a widget property"""
+        if (widget := self.widgets.get(widget_id)) and property_name in widget.properties:
+            prop = widget.properties[property_name]
+            if prop.value == value:
+                return
+            
+            # Rapid edits to the same property are coalesced into one undo step
+            pending = self._pending_prop_edit
+            if pending is not None and pending[:2] != (widget_id, property_name):
+                self._commit_prop_edit()
+                pending = None
+            if pending is None:
+                self._pending_prop_edit = (widget_id, property_name, widget.to_dict())
+            
+            prop.value = value
+            self._prop_records.pop(widget_id, None)
+            self.render_widget(widget)
+            
+            if self._prop_edit_after_id:
+                self.after_cancel(self._prop_edit_after_id)
+            self._prop_edit_after_id = self.after(300, self._commit_prop_edit)
+            
+            self.mark_modified()
+    
+    def _commit_prop_edit(self):
+        """Push the undo entry for the current burst of property edits"""
+        if self._prop_edit_after_id:
+            self.after_cancel(self._prop_edit_after_id)
+            self._prop_edit_after_id = None
+        
+        pending = self._pending_prop_edit
+        if pending is None:
+            return
+        self._pending_prop_edit = None
+        
+        widget_id, _, before = pending
         if widget_id in self.widgets:
-            if property_name in self.widgets[widget_id].properties:
-                self.widgets[widget_id].properties[property_name].value = value
-                self.render_widget(self.widgets[widget_id])
-                
-                # Mark project as modified
-                main_app = self.winfo_toplevel()
-                if hasattr(main_app, 'project_modified'):
-                    main_app.project_modified = True
-                    main_app.update_status_info()
+            self.push_history(HistoryEntry('prop', widget_id, before, self.widgets[widget_id].to_dict()))
     
     def highlight_widgets_from_code(self, widget_ids: List[str]):
         """Highlight widgets that were updated from code"""
@@ -934,19 +1665,27 @@ class DesignCanvas(ctk.CTkCanvas):
             self.delete("code_update_highlight")
             
             # Highlight each widget with a temporary border
+            create_rectangle = self.create_rectangle
             for widget_id in widget_ids:
                 if widget_id in self.widgets:
                     widget = self.widgets[widget_id]
                     
                     # Create a temporary highlight rectangle
-                    highlight_id = self.create_rectangle(
+                    create_rectangle(
                         widget.x - 2, widget.y - 2,
                         widget.x + widget.width + 2, widget.y + widget.height + 2,
                         outline="#00ff00", width=3, fill="", tags="code_update_highlight"
                     )
-                    
-                    # Remove highlight after 2 seconds
-                    self.after(2000, lambda: self.delete("code_update_highlight"))
+            
+            # Remove all highlights after 2 seconds, restarting the wait if a newer update arrived
+            if self._highlight_after is not None:
+                self.after_cancel(self._highlight_after)
+            self._highlight_after = self.after(2000, self._clear_code_highlight)
             
         except Exception as e:
             print(f"Error highlighting widgets: {e}")
+    
+    def _clear_code_highlight(self):
+        """Remove the highlights added by highlight_widgets_from_code"""
+        self._highlight_after = None
+        self.delete("code_update_highlight")
@@ -4,8 +4,87 @@ Properties editor component for the GUI Builder application.
 """
 
 import customtkinter as ctk
-from typing import Dict, Optional
+from functools import partial
+from typing import Callable, Dict, Optional, Tuple
 from models.widget_types import WidgetData, WidgetProperty
+from ._fonts import font
+
+
+def _parse_int(text: str) -> int:
+    """Parse an integer property entry, treating anything unparsable as 0"""
+    try:
+        return int(text.strip())
+    except ValueError:
+        return 0
+
+
+def _make_entry(panel: "PropertiesEditor", prop_name: str, prop: WidgetProperty) -> ctk.CTkEntry:
+    """Create an entry editor for a text or number property"""
+    editor = ctk.CTkEntry(
+        panel.properties_frame,
+        placeholder_text=f"Enter {prop.name}",
+        width=200
+    )
+    editor.insert(0, str(prop.value))
+    editor.bind("<KeyRelease>", partial(panel._on_key_release, prop_name))
+    return editor
+
+
+def _update_entry(editor: ctk.CTkEntry, prop: WidgetProperty):
+    """Show a property value in an entry editor"""
+    text = str(prop.value)
+    if editor.get() != text:
+        editor.delete(0, "end")
+        editor.insert(0, text)
+
+
+def _make_checkbox(panel: "PropertiesEditor", prop_name: str, prop: WidgetProperty) -> ctk.CTkCheckBox:
+    """Create a checkbox editor for a boolean property"""
+    editor = ctk.CTkCheckBox(
+        panel.properties_frame,
+        text="",
+        width=200,
+        command=partial(panel._on_editor_command, prop_name)
+    )
+    if prop.value:
+        editor.select()
+    return editor
+
+
+def _update_checkbox(editor: ctk.CTkCheckBox, prop: WidgetProperty):
+    """Show a property value in a checkbox editor"""
+    if prop.value:
+        editor.select()
+    else:
+        editor.deselect()
+
+
+def _make_combobox(panel: "PropertiesEditor", prop_name: str, prop: WidgetProperty) -> ctk.CTkComboBox:
+    """Create a combo box editor for a property with fixed options"""
+    editor = ctk.CTkComboBox(
+        panel.properties_frame,
+        values=prop.options or [],
+        width=200,
+        command=partial(panel._on_editor_command, prop_name)
+    )
+    editor.set(prop.value)
+    return editor
+
+
+def _update_combobox(editor: ctk.CTkComboBox, prop: WidgetProperty):
+    """Show a property value and its options in a combo box editor"""
+    editor.configure(values=prop.options or [])
+    editor.set(prop.value)
+
+
+# Property type -> (create editor, refresh editor); other types are edited as text
+_ENTRY_EDITOR = (_make_entry, _update_entry)
+_EDITOR_FACTORIES: Dict[str, Tuple[Callable, Callable]] = {
+    "str": _ENTRY_EDITOR,
+    "int": _ENTRY_EDITOR,
+    "bool": (_make_checkbox, _update_checkbox),
+    "list": (_make_combobox, _update_combobox),
+}
 
 
 class PropertiesEditor(ctk.CTkFrame):
@@ -15,7 +94,10 @@ class PropertiesEditor(ctk.CTkFrame):
         super().__init__(parent)
         self.on_property_change = on_property_change
         self.current_widget: Optional[WidgetData] = None
-        self.property_widgets: Dict[str, ctk.CTkBaseClass] = {}
+        # prop_name -> (prop type, label, editor); editors are reused across selections
+        self.property_widgets: Dict[str, Tuple[str, ctk.CTkLabel, ctk.CTkBaseClass]] = {}
+        self._packed_order: Optional[tuple] = None
+        self._pending_after: Dict[str, str] = {}  # prop_name -> debounced entry commit
         
         self.setup_ui()
     
@@ -24,7 +106,7 @@ class PropertiesEditor(ctk.CTkFrame):
         self.pack_propagate(False)
         
         # Title
-        title = ctk.CTkLabel(self, text="Properties", font=ctk.CTkFont(size=16, weight="bold"))
+        title = ctk.CTkLabel(self, text="Properties", font=font(16, "bold"))
         title.pack(pady=10)
         
         # Properties frame
@@ -35,35 +117,65 @@ class PropertiesEditor(ctk.CTkFrame):
         self.no_selection_label = ctk.CTkLabel(
             self.properties_frame,
             text="Select a widget to edit its properties",
-            font=ctk.CTkFont(size=12)
+            font=font(12)
         )
         self.no_selection_label.pack(pady=20)
     
     def set_widget(self, widget_data: Optional[WidgetData]):
         """Set the current widget for editing"""
-        self.current_widget = widget_data
+        # Commit typing still waiting on the debounce to the widget it was typed for
+        for prop_name in list(self._pending_after):
+            self.after_cancel(self._pending_after[prop_name])
+            self._commit_entry(prop_name)
         
-        # Clear existing property widgets
-        for widget in self.property_widgets.values():
-            widget.destroy()
-        self.property_widgets.clear()
-        
-        # Clear the properties frame completely
-        for child in self.properties_frame.winfo_children():
-            child.destroy()
+        self.current_widget = widget_data
         
         if widget_data is None:
-            self.no_selection_label = ctk.CTkLabel(
-                self.properties_frame,
-                text="Select a widget to edit its properties",
-                font=ctk.CTkFont(size=12)
-            )
+            # Keep the editors around hidden so the next selection can reuse them
+            self._unpack_editors()
             self.no_selection_label.pack(pady=20)
             return
+        self.no_selection_label.pack_forget()
+        
+        properties = widget_data.properties
+        
+        # Drop editors for properties the new widget lacks or types it edits differently
+        stale = [prop_name for prop_name, (prop_type, _, _) in self.property_widgets.items()
+                 if prop_name not in properties or properties[prop_name].type != prop_type]
+        for prop_name in stale:
+            _, label, editor = self.property_widgets.pop(prop_name)
+            label.destroy()
+            editor.destroy()
+        if stale:
+            self._packed_order = None
+        
+        # Refresh reused editors in place and create only the missing ones
+        for prop_name, prop in properties.items():
+            if prop_name in self.property_widgets:
+                self._update_editor(self.property_widgets[prop_name][2], prop)
+            else:
+                self.create_property_editor(prop_name, prop)
+                self._packed_order = None
         
-        # Create property editors
-        for prop_name, prop in widget_data.properties.items():
-            self.create_property_editor(prop_name, prop)
+        order = tuple(properties)
+        if order != self._packed_order:
+            self._unpack_editors()
+            for prop_name in order:
+                _, label, editor = self.property_widgets[prop_name]
+                label.pack(pady=(10, 5), anchor="w")
+                editor.pack(pady=2, anchor="w")
+            self._packed_order = order
+    
+    def _unpack_editors(self):
+        """Hide every property label and editor"""
+        for _, label, editor in self.property_widgets.values():
+            label.pack_forget()
+            editor.pack_forget()
+        self._packed_order = None
+    
+    def _update_editor(self, editor: ctk.CTkBaseClass, prop: WidgetProperty):
+        """Show a property's current value in an existing editor"""
+        _EDITOR_FACTORIES.get(prop.type, _ENTRY_EDITOR)[1](editor, prop)
     
     def create_property_editor(self, prop_name: str, prop: WidgetProperty):
         """Create a property editor widget"""
@@ -71,56 +183,31 @@ class PropertiesEditor(ctk.CTkFrame):
         label = ctk.CTkLabel(
             self.properties_frame,
             text=prop.name.replace("_", " ").title(),
-            font=ctk.CTkFont(weight="bold")
+            font=font(weight="bold")
         )
-        label.pack(pady=(10, 5), anchor="w")
         
         # Property editor based on type
-        if prop.type == "str":
-            editor = ctk.CTkEntry(
-                self.properties_frame,
-                placeholder_text=f"Enter {prop.name}",
-                width=200
-            )
-            editor.insert(0, str(prop.value))
-            editor.bind("<KeyRelease>", lambda e, pn=prop_name: self.on_property_change(pn, editor.get()))
-            
-        elif prop.type == "int":
-            editor = ctk.CTkEntry(
-                self.properties_frame,
-                placeholder_text=f"Enter {prop.name}",
-                width=200
-            )
-            editor.insert(0, str(prop.value))
-            editor.bind("<KeyRelease>", lambda e, pn=prop_name: self.on_property_change(pn, int(editor.get()) if editor.get().isdigit() else 0))
-            
-        elif prop.type == "bool":
-            editor = ctk.CTkCheckBox(
-                self.properties_frame,
-                text="",
-                width=200
-            )
-            if prop.value:
-                editor.select()
-            editor.configure(command=lambda pn=prop_name: self.on_property_change(pn, editor.get()))
-            
-        elif prop.type == "list":
-            editor = ctk.CTkComboBox(
-                self.properties_frame,
-                values=prop.options or [],
-                width=200
-            )
-            editor.set(prop.value)
-            editor.configure(command=lambda pn=prop_name: self.on_property_change(pn, editor.get()))
-            
-        else:
-            editor = ctk.CTkEntry(
-                self.properties_frame,
-                placeholder_text=f"Enter {prop.name}",
-                width=200
-            )
-            editor.insert(0, str(prop.value))
-            editor.bind("<KeyRelease>", lambda e, pn=prop_name: self.on_property_change(pn, editor.get()))
-        
-        self.property_widgets[prop_name] = editor
-        editor.pack(pady=2, anchor="w")
+        editor = _EDITOR_FACTORIES.get(prop.type, _ENTRY_EDITOR)[0](self, prop_name, prop)
+        self.property_widgets[prop_name] = (prop.type, label, editor)
+    
+    def _on_key_release(self, prop_name: str, event):
+        """Schedule reporting an edit in a property entry once typing pauses"""
+        pending = self._pending_after.get(prop_name)
+        if pending is not None:
+            self.after_cancel(pending)
+        self._pending_after[prop_name] = self.after(120, self._commit_entry, prop_name)
+    
+    def _commit_entry(self, prop_name: str):
+        """Report the current text of a property entry"""
+        self._pending_after.pop(prop_name, None)
+        if self.current_widget is None:
+            return
+        prop_type, _, editor = self.property_widgets[prop_name]
+        value = editor.get()
+        if prop_type == "int":
+            value = _parse_int(value)
+        self.on_property_change(prop_name, value, self.current_widget.id)
+    
+    def _on_editor_command(self, prop_name: str, *args):
+        """Report a checkbox toggle or combo box choice"""
+        self.on_property_change(prop_name, self.property_widgets[prop_name][2].get())
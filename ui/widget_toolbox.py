@@ -4,7 +4,9 @@ Widget toolbox component for the GUI Builder application.
 """
 
 import customtkinter as ctk
+from functools import partial
 from models.widget_types import WidgetType
+from ._fonts import font
 
 
 class WidgetToolbox(ctk.CTkFrame):
@@ -14,6 +16,7 @@ class WidgetToolbox(ctk.CTkFrame):
         super().__init__(parent)
         self.on_widget_drag_start = on_widget_drag_start
         self.dragging_widget = None
+        self._canvas = None  # Design canvas, resolved on first use
         self.setup_ui()
     
     def setup_ui(self):
@@ -21,7 +24,7 @@ class WidgetToolbox(ctk.CTkFrame):
         self.pack_propagate(False)
         
         # Title
-        title = ctk.CTkLabel(self, text="Widget Toolbox", font=ctk.CTkFont(size=16, weight="bold"))
+        title = ctk.CTkLabel(self, text="Widget Toolbox", font=font(16, "bold"))
         title.pack(pady=10)
         
         # Widget categories
@@ -44,55 +47,53 @@ class WidgetToolbox(ctk.CTkFrame):
         category_frame.pack(fill="x", padx=10, pady=5)
         
         # Category title
-        cat_label = ctk.CTkLabel(category_frame, text=title, font=ctk.CTkFont(weight="bold"))
+        cat_label = ctk.CTkLabel(category_frame, text=title, font=font(weight="bold"))
         cat_label.pack(pady=5)
         
         # Widget buttons
         for name, widget_type, icon in widgets:
-            # Create a closure to capture the widget_type properly
-            def make_click_handler(wt):
-                return lambda: self.on_widget_click(wt)
-            
-            def make_drag_handler(wt):
-                return lambda e: self.start_drag(e, wt)
-            
             btn = ctk.CTkButton(
                 category_frame,
                 text=f"{icon} {name}",
-                command=make_click_handler(widget_type),
+                command=partial(self.on_widget_click, widget_type),
                 height=30,
                 width=150
             )
             # Bind drag events
-            btn.bind("<Button-1>", make_drag_handler(widget_type))
-            btn.bind("<B1-Motion>", self.on_drag)
+            btn.bind("<Button-1>", partial(self.start_drag, widget_type=widget_type))
             btn.bind("<ButtonRelease-1>", self.end_drag)
             btn.pack(pady=2)
     
     def on_widget_click(self, widget_type: WidgetType):
         """Handle widget button click - add widget to canvas"""
-        # Get the canvas reference from the main app
-        main_app = self.winfo_toplevel()
-        if hasattr(main_app, 'canvas'):
+        canvas = self._resolve_canvas()
+        if canvas is not None:
             # Check if canvas is being interacted with
-            if getattr(main_app.canvas, 'canvas_interacting', False):
+            if getattr(canvas, 'canvas_interacting', False):
                 return  # Don't add widget if canvas is being interacted with
             
             # Check if this is part of a drag operation - if so, don't add widget here
             # The end_drag method will handle it if it was a real drag
-            if hasattr(self, 'dragging_widget') and self.dragging_widget:
+            if self.dragging_widget:
                 return  # Don't add widget if drag is in progress
             
-            # Add widget at center of canvas
-            canvas_width = main_app.canvas.winfo_width()
-            canvas_height = main_app.canvas.winfo_height()
-            x = max(50, canvas_width // 2 - 50)
-            y = max(50, canvas_height // 2 - 15)
-            main_app.canvas.add_widget(widget_type, x, y)
+            self._add_at_canvas_center(canvas, widget_type)
             # Clear any existing selection to prevent duplication
-            main_app.canvas.deselect_all()
+            canvas.deselect_all()
             # Reset interaction flag
-            main_app.canvas.canvas_interacting = False
+            canvas.canvas_interacting = False
+    
+    def _resolve_canvas(self):
+        """Get the design canvas from the main app, caching it once it exists"""
+        if self._canvas is None:
+            self._canvas = getattr(self.winfo_toplevel(), 'canvas', None)
+        return self._canvas
+    
+    def _add_at_canvas_center(self, canvas, widget_type: WidgetType):
+        """Add a widget near the center of the canvas"""
+        x = max(50, canvas.winfo_width() // 2 - 50)
+        y = max(50, canvas.winfo_height() // 2 - 15)
+        canvas.add_widget(widget_type, x, y)
     
     def start_drag(self, event, widget_type):
         """Start drag operation"""
@@ -100,12 +101,6 @@ class WidgetToolbox(ctk.CTkFrame):
         self.drag_start_x = event.x_root
         self.drag_start_y = event.y_root
     
-    def on_drag(self, event):
-        """Handle drag motion"""
-        if self.dragging_widget:
-            # Visual feedback could be added here
-            pass
-    
     def end_drag(self, event):
         """End drag operation"""
         if self.dragging_widget:
@@ -115,11 +110,7 @@ class WidgetToolbox(ctk.CTkFrame):
                 abs(event.x_root - self.drag_start_x) > 5 and 
                 abs(event.y_root - self.drag_start_y) > 5):
                 # This was a real drag operation
-                main_app = self.winfo_toplevel()
-                if hasattr(main_app, 'canvas'):
-                    canvas_width = main_app.canvas.winfo_width()
-                    canvas_height = main_app.canvas.winfo_height()
-                    x = max(50, canvas_width // 2 - 50)
-                    y = max(50, canvas_height // 2 - 15)
-                    main_app.canvas.add_widget(self.dragging_widget, x, y)
+                canvas = self._resolve_canvas()
+                if canvas is not None:
+                    self._add_at_canvas_center(canvas, self.dragging_widget)
             self.dragging_widget = None
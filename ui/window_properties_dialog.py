@@ -6,7 +6,21 @@ Window properties dialog for the GUI Builder application.
 import customtkinter as ctk
 import tkinter as tk
 from tkinter import messagebox
+from types import MappingProxyType
 from typing import Dict, Any, Callable
+from ._fonts import font
+
+# Window properties restored by Reset to Defaults
+_DEFAULT_WINDOW_PROPS = MappingProxyType({
+    'title': 'Generated GUI',
+    'width': 800,
+    'height': 600,
+    'resizable': True,
+    'min_width': 400,
+    'min_height': 300,
+    'center_on_screen': True,
+    'auto_fit': True
+})
 
 class WindowPropertiesDialog(ctk.CTkToplevel):
     """Dialog for editing window properties of the generated application"""
@@ -19,15 +33,13 @@ class WindowPropertiesDialog(ctk.CTkToplevel):
         self.on_apply_callback = on_apply_callback
         
         self.title("Window Properties")
-        self.geometry("500x600")
         self.minsize(400, 500)
         
         # Make this window modal
         self.transient(parent_app)
         self.grab_set()
         
-        # Center the window
-        self.update_idletasks()
+        # Center the window; only the screen size is needed, so no layout flush
         x = (self.winfo_screenwidth() // 2) - (500 // 2)
         y = (self.winfo_screenheight() // 2) - (600 // 2)
         self.geometry(f"500x600+{x}+{y}")
@@ -45,7 +57,7 @@ class WindowPropertiesDialog(ctk.CTkToplevel):
         title_label = ctk.CTkLabel(
             content_frame,
             text="Window Properties",
-            font=ctk.CTkFont(size=20, weight="bold")
+            font=font(20, "bold")
         )
         title_label.pack(pady=10)
         
@@ -53,7 +65,7 @@ class WindowPropertiesDialog(ctk.CTkToplevel):
         title_frame = ctk.CTkFrame(content_frame)
         title_frame.pack(fill="x", pady=5)
         
-        ctk.CTkLabel(title_frame, text="Window Title:", font=ctk.CTkFont(weight="bold")).pack(anchor="w", padx=10, pady=5)
+        ctk.CTkLabel(title_frame, text="Window Title:", font=font(weight="bold")).pack(anchor="w", padx=10, pady=5)
         self.title_entry = ctk.CTkEntry(title_frame, width=400)
         self.title_entry.insert(0, self.window_properties.get('title', 'Generated GUI'))
         self.title_entry.pack(padx=10, pady=5)
@@ -62,7 +74,7 @@ class WindowPropertiesDialog(ctk.CTkToplevel):
         size_frame = ctk.CTkFrame(content_frame)
         size_frame.pack(fill="x", pady=5)
         
-        ctk.CTkLabel(size_frame, text="Window Size:", font=ctk.CTkFont(weight="bold")).pack(anchor="w", padx=10, pady=5)
+        ctk.CTkLabel(size_frame, text="Window Size:", font=font(weight="bold")).pack(anchor="w", padx=10, pady=5)
         
         size_input_frame = ctk.CTkFrame(size_frame)
         size_input_frame.pack(fill="x", padx=10, pady=5)
@@ -81,7 +93,7 @@ class WindowPropertiesDialog(ctk.CTkToplevel):
         auto_fit_frame = ctk.CTkFrame(content_frame)
         auto_fit_frame.pack(fill="x", pady=5)
         
-        ctk.CTkLabel(auto_fit_frame, text="Auto-fit Options:", font=ctk.CTkFont(weight="bold")).pack(anchor="w", padx=10, pady=5)
+        ctk.CTkLabel(auto_fit_frame, text="Auto-fit Options:", font=font(weight="bold")).pack(anchor="w", padx=10, pady=5)
         
         self.auto_fit_checkbox = ctk.CTkCheckBox(
             auto_fit_frame, 
@@ -96,7 +108,7 @@ class WindowPropertiesDialog(ctk.CTkToplevel):
         min_size_frame = ctk.CTkFrame(content_frame)
         min_size_frame.pack(fill="x", pady=5)
         
-        ctk.CTkLabel(min_size_frame, text="Minimum Size:", font=ctk.CTkFont(weight="bold")).pack(anchor="w", padx=10, pady=5)
+        ctk.CTkLabel(min_size_frame, text="Minimum Size:", font=font(weight="bold")).pack(anchor="w", padx=10, pady=5)
         
         min_size_input_frame = ctk.CTkFrame(min_size_frame)
         min_size_input_frame.pack(fill="x", padx=10, pady=5)
@@ -115,7 +127,7 @@ class WindowPropertiesDialog(ctk.CTkToplevel):
         options_frame = ctk.CTkFrame(content_frame)
         options_frame.pack(fill="x", pady=5)
         
-        ctk.CTkLabel(options_frame, text="Window Options:", font=ctk.CTkFont(weight="bold")).pack(anchor="w", padx=10, pady=5)
+        ctk.CTkLabel(options_frame, text="Window Options:", font=font(weight="bold")).pack(anchor="w", padx=10, pady=5)
         
         self.resizable_checkbox = ctk.CTkCheckBox(
             options_frame, 
@@ -203,45 +215,22 @@ class WindowPropertiesDialog(ctk.CTkToplevel):
     
     def reset_to_defaults(self):
         """Reset window properties to defaults"""
-        default_properties = {
-            'title': 'Generated GUI',
-            'width': 800,
-            'height': 600,
-            'resizable': True,
-            'min_width': 400,
-            'min_height': 300,
-            'center_on_screen': True,
-            'auto_fit': True
-        }
-        
         # Update the dialog fields
-        self.title_entry.delete(0, "end")
-        self.title_entry.insert(0, default_properties['title'])
-        self.width_entry.delete(0, "end")
-        self.width_entry.insert(0, str(default_properties['width']))
-        self.height_entry.delete(0, "end")
-        self.height_entry.insert(0, str(default_properties['height']))
-        self.min_width_entry.delete(0, "end")
-        self.min_width_entry.insert(0, str(default_properties['min_width']))
-        self.min_height_entry.delete(0, "end")
-        self.min_height_entry.insert(0, str(default_properties['min_height']))
+        for entry, key in ((self.title_entry, 'title'), (self.width_entry, 'width'),
+                           (self.height_entry, 'height'), (self.min_width_entry, 'min_width'),
+                           (self.min_height_entry, 'min_height')):
+            entry.delete(0, "end")
+            entry.insert(0, str(_DEFAULT_WINDOW_PROPS[key]))
         
         # Update checkboxes
-        if default_properties['resizable']:
-            self.resizable_checkbox.select()
-        else:
-            self.resizable_checkbox.deselect()
-            
-        if default_properties['center_on_screen']:
-            self.center_checkbox.select()
-        else:
-            self.center_checkbox.deselect()
-            
-        if default_properties['auto_fit']:
-            self.auto_fit_checkbox.select()
-        else:
-            self.auto_fit_checkbox.deselect()
+        for checkbox, key in ((self.resizable_checkbox, 'resizable'),
+                              (self.center_checkbox, 'center_on_screen'),
+                              (self.auto_fit_checkbox, 'auto_fit')):
+            if _DEFAULT_WINDOW_PROPS[key]:
+                checkbox.select()
+            else:
+                checkbox.deselect()
         
         # Update the properties dictionary
         self.window_properties.clear()
-        self.window_properties.update(default_properties)
+        self.window_properties.update(_DEFAULT_WINDOW_PROPS)
@@ -3,7 +3,25 @@
 Utilities package for the GUI Builder application.
 """
 
-from .constants import *
+from .constants import (
+    APP_NAME,
+    APP_VERSION,
+    APP_DESCRIPTION,
+    DEFAULT_WINDOW_WIDTH,
+    DEFAULT_WINDOW_HEIGHT,
+    DEFAULT_GRID_SIZE,
+    DEFAULT_CANVAS_BACKGROUND,
+    DEFAULT_BUTTON_WIDTH,
+    DEFAULT_BUTTON_HEIGHT,
+    DEFAULT_LABEL_WIDTH,
+    DEFAULT_LABEL_HEIGHT,
+    DEFAULT_ENTRY_WIDTH,
+    DEFAULT_ENTRY_HEIGHT,
+    PROJECT_EXTENSION,
+    PYTHON_EXTENSION,
+    THEMES,
+    APPEARANCE_MODES
+)
 
 __all__ = [
     'APP_NAME',
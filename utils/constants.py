@@ -3,6 +3,8 @@
 Application constants for the GUI Builder application.
 """
 
+from types import MappingProxyType
+
 # Application Information
 APP_NAME = "Professional Python GUI Builder"
 APP_VERSION = "1.0.0"
@@ -27,11 +29,11 @@ PROJECT_EXTENSION = ".pygui"
 PYTHON_EXTENSION = ".py"
 
 # Color Themes
-THEMES = {
+THEMES = MappingProxyType({
     "blue": "#1f538d",
     "green": "#00C851", 
     "dark-blue": "#14375e"
-}
+})
 
 # Appearance Modes
-APPEARANCE_MODES = ["light", "dark", "system"]
+APPEARANCE_MODES = ("light", "dark", "system")